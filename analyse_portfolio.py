@@ -1,16 +1,33 @@
 # analyse_portfolio.py
 import os
+import itertools
 import yaml
 import yfinance as yf
 import pandas as pd
+import numpy as np
 from datetime import datetime, timedelta
 import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 import random
+import html
 import logging
-from curl_cffi import requests
+import logging.handlers
+import atexit
+import queue
+from concurrent.futures import ThreadPoolExecutor
+from curl_cffi import requests, CurlHttpVersion
 import yfinance_cookie_patch
+from cache_utils import load_cached_data, save_to_cache
+
+# Réductions en C de bottleneck lorsqu'il est installé, sinon NumPy
+try:
+    import bottleneck as bn
+    _ecart_type = bn.nanstd
+    _minimum = bn.nanmin
+except ImportError:
+    _ecart_type = np.nanstd
+    _minimum = np.nanmin
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 
@@ -21,14 +38,26 @@ if not logger.handlers:
     handler = logging.FileHandler(os.path.join(BASE_DIR, 'portfolio_analysis.log'))
     formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
     handler.setFormatter(formatter)
-    logger.addHandler(handler)
+    # Les écritures dans le fichier sont faites par un thread dédié pour ne
+    # jamais bloquer les threads de téléchargement
+    _log_queue = queue.SimpleQueue()
+    _log_listener = logging.handlers.QueueListener(_log_queue, handler)
+    _log_listener.start()
+    atexit.register(_log_listener.stop)
+    logger.addHandler(logging.handlers.QueueHandler(_log_queue))
 logger.propagate = False
 
+# Chargeur YAML en C (libyaml) lorsqu'il est disponible
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
 # Chargement de la configuration globale et des proxies
 CONFIG_FILE = os.path.join(BASE_DIR, 'config.yaml')
 try:
     with open(CONFIG_FILE, 'r') as f:
-        CFG = yaml.safe_load(f)
+        CFG = yaml.load(f, Loader=_YamlLoader)
 except Exception as e:
     logger.error("Erreur lors du chargement du fichier de configuration: %s", e)
     CFG = {}
@@ -41,35 +70,195 @@ PROXIES = CFG.get('proxies', [
 ])
 # Possibilité de désactiver complètement l'utilisation des proxies
 USE_PROXIES = CFG.get('use_proxies', True)
+# Correspondances protocole -> proxy, construites une seule fois par proxy
+_PROXY_MAPPINGS = {proxy: dict.fromkeys(("http", "https"), proxy) for proxy in PROXIES}
 
-# Session HTTP global avec impersonation Chrome
-SESSION = requests.Session(impersonate="chrome")
+# Session HTTP unique avec impersonation Chrome : les lots, téléchargés l'un
+# après l'autre, réutilisent la même connexion HTTP/2 vers Yahoo Finance
+_SESSION = None
 yfinance_cookie_patch.patch_yfdata_cookie_basic()
 
-
-def set_random_proxy():
-    """Choisit un proxy aléatoirement et le définit pour les requêtes."""
+# Nombre maximal de symboles par requête de téléchargement Yahoo Finance
+YF_BATCH_SIZE = 20
+# Threads utilisés pour lire et écrire le cache disque des historiques
+MAX_DOWNLOAD_WORKERS = 16
+# Au-delà de cet âge, l'historique en cache est retéléchargé entièrement au
+# lieu d'être complété par les seules séances manquantes
+HISTORY_CACHE_MAX_AGE = timedelta(days=7)
+# Nombre de séances nécessaires aux moyennes long terme (moyenne 12 mois)
+SEANCES_LONG_TERME = 252
+
+# Les variables d'environnement d'un proxy système ne doivent pas être
+# utilisées lorsque les proxies sont désactivés
+if not USE_PROXIES:
+    for var in ["HTTP_PROXY", "HTTPS_PROXY", "http_proxy", "https_proxy"]:
+        os.environ.pop(var, None)
+
+
+def get_session():
+    """Retourne la session HTTP partagée, créée au premier appel."""
+    global _SESSION
+    if _SESSION is None:
+        _SESSION = requests.Session(impersonate="chrome", http_version=CurlHttpVersion.V2_0)
+    return _SESSION
+
+
+def set_random_proxy(session):
+    """Choisit un proxy aléatoirement et le définit sur la session donnée."""
     if not USE_PROXIES:
-        # Nettoyer complètement les variables d'environnement pouvant indiquer
-        # l'utilisation d'un proxy
-        for var in ["HTTP_PROXY", "HTTPS_PROXY", "http_proxy", "https_proxy"]:
-            os.environ.pop(var, None)
-        SESSION.proxies.clear()
+        session.proxies.clear()
         logger.info("Utilisation des proxies désactivée")
         return None
 
     proxy = random.choice(PROXIES)
-    os.environ["HTTP_PROXY"] = proxy
-    os.environ["HTTPS_PROXY"] = proxy
-    SESSION.proxies.update({"http": proxy, "https": proxy})
-    logger.info(f"Proxy choisi: {proxy}")
+    session.proxies.update(_PROXY_MAPPINGS[proxy])
+    logger.info("Proxy choisi: %s", proxy)
     return proxy
 
+
+def _par_lots(elements, taille):
+    """Découpe une séquence en lots successifs d'au plus ``taille`` éléments."""
+    iterateur = iter(elements)
+    while True:
+        lot = list(itertools.islice(iterateur, taille))
+        if not lot:
+            return
+        yield lot
+
+
+def _extraire_historique(data, symbol):
+    """Extrait l'historique d'un symbole d'un DataFrame renvoyé par yf.download."""
+    if isinstance(data.columns, pd.MultiIndex):
+        if symbol not in data.columns.get_level_values(0):
+            return pd.DataFrame()
+        data = data[symbol]
+    return data.dropna(how='all')
+
+def _extraire_clotures(hist):
+    """Retourne les clôtures d'un historique sous forme de tableau float64,
+    ou None si l'historique est absent ou vide."""
+    if hist is None or hist.empty:
+        return None
+    return hist['Close'].dropna().to_numpy(dtype=np.float64)
+
+def _resumer_cours(closes):
+    """Calcule en une seule passe les statistiques de fin de série utilisées
+    par l'analyse d'une action (moyennes, volatilité et support)."""
+    n = len(closes)
+    # Sommes cumulées : la moyenne des k clôtures finissant à l'indice fin
+    # vaut (cumul[fin] - cumul[fin - k]) / k
+    cumul = np.concatenate(([0.0], np.cumsum(closes)))
+
+    def moyenne(k, decalage=0):
+        fin = n - decalage
+        return (cumul[fin] - cumul[fin - k]) / k
+
+    resume = {
+        'dernier': closes[-1],
+        'mm20': None,
+        'mm20_precedente': None,
+        'moyenne_3m': None,
+        'moyenne_6m': None,
+        'moyenne_12m': None,
+        'volatilite_30j': None,
+        'support_20j': None,
+    }
+    if n >= 24:
+        resume['mm20'] = moyenne(20)
+        resume['mm20_precedente'] = moyenne(20, decalage=4)
+    if n >= 252:
+        resume['moyenne_3m'] = moyenne(90)
+        resume['moyenne_6m'] = moyenne(180)
+        resume['moyenne_12m'] = moyenne(252)
+    if n >= 20:
+        fenetre = closes[-30:]
+        resume['volatilite_30j'] = _ecart_type(np.diff(fenetre) / fenetre[:-1], ddof=1)
+        resume['support_20j'] = _minimum(closes[-20:])
+    return resume
+
+
+# Colonnes de la matrice des variations : 1 jour, 3 mois, 6 mois, depuis l'achat
+VARIATION_PERIODS = (1, 90, 180)
+# Clés des variations dans les lignes du rapport, dans l'ordre de VARIATION_PERIODS
+VARIATION_KEYS = ('v1d', 'v3m', 'v6m')
+
+
+class PortfolioArrays:
+    """Portefeuille stocké par colonnes : un tableau NumPy par champ.
+
+    ``current_px`` vaut NaN tant que la ligne n'a pas pu être analysée ; ces
+    lignes sont ignorées dans les totaux. ``variations`` est une matrice
+    (N, 4) dont les colonnes suivent ``VARIATION_PERIODS`` puis la variation
+    depuis l'achat.
+    """
+
+    def __init__(self, symbols, qty, buy_px, current_px=None, variations=None):
+        self.symbols = list(symbols)
+        self.qty = np.asarray(qty, dtype=np.float64)
+        self.buy_px = np.asarray(buy_px, dtype=np.float64)
+        if current_px is None:
+            current_px = np.full(len(self.symbols), np.nan)
+        self.current_px = np.asarray(current_px, dtype=np.float64)
+        if variations is None:
+            variations = np.zeros((len(self.symbols), len(VARIATION_PERIODS) + 1))
+        self.variations = np.asarray(variations, dtype=np.float64)
+
+    @classmethod
+    def from_config(cls, portfolio):
+        """Construit les tableaux à partir de la section ``portfolio`` de la configuration."""
+        return cls(
+            [stock['symbol'] for stock in portfolio],
+            [stock['quantity'] for stock in portfolio],
+            [stock['purchase_price'] for stock in portfolio],
+        )
+
+    @classmethod
+    def from_rows(cls, portfolio_data):
+        """Construit les tableaux à partir des lignes déjà analysées."""
+        return cls(
+            [stock['symbol'] for stock in portfolio_data],
+            [stock['quantity'] for stock in portfolio_data],
+            [stock['purchase_price'] for stock in portfolio_data],
+            [stock['current_price'] for stock in portfolio_data],
+            [_ligne_variations(stock) for stock in portfolio_data],
+        )
+
+    def analysees(self):
+        """Indices des lignes analysées, dans l'ordre du portefeuille."""
+        return np.flatnonzero(~np.isnan(self.current_px))
+
+    def totals(self):
+        """Retourne (valeur, coût, gain, performance en %) des lignes analysées.
+
+        Valeur et coût sont obtenus par un seul produit matriciel ; le gain et
+        la performance en sont déduits.
+        """
+        analysees = self.analysees()
+        prix = np.stack((self.current_px[analysees], self.buy_px[analysees]))
+        valeur, cout = (prix @ self.qty[analysees]).tolist()
+        gain = valeur - cout
+        performance = (gain / cout * 100) if cout > 0 else 0.0
+        return valeur, cout, gain, performance
+
+
+def _ligne_variations(stock):
+    """Ligne de la matrice des variations pour une action analysée."""
+    return [stock['v1d'], stock['v3m'], stock['v6m'], stock['purchase_variation']]
+
+# Table de traduction du séparateur de milliers, appliquée en une seule passe
+_COMMA_TO_SPACE = str.maketrans({',': ' '})
+
+# Couleurs associées au signe d'une valeur
+_COLOR_POSITIVE = "#059669"  # Vert
+_COLOR_NEGATIVE = "#dc2626"  # Rouge
+_COLOR_NEUTRAL = "#1a1a1a"   # Noir (neutre)
+
+
 class PortfolioUtils:
     @staticmethod
     def format_money(amount):
         """Formate un montant en euros avec séparateur de milliers."""
-        return f"{amount:,.2f} €".replace(',', ' ')
+        return format(amount, ',.2f').translate(_COMMA_TO_SPACE) + ' €'
 
     @staticmethod
     def format_percentage(value):
@@ -80,54 +269,55 @@ class PortfolioUtils:
     def get_color_for_value(value):
         """Retourne une couleur en fonction de la valeur."""
         if value > 0:
-            return "#059669"  # Vert
-        elif value < 0:
-            return "#dc2626"  # Rouge
-        return "#1a1a1a"     # Noir (neutre)
+            return _COLOR_POSITIVE
+        if value < 0:
+            return _COLOR_NEGATIVE
+        return _COLOR_NEUTRAL
 
 class PortfolioAnalyzer:
     def __init__(self, utils=None):
         self.utils = utils or PortfolioUtils()
+        self.arrays = None
 
-    def calculer_tendance(self, historique):
+    def calculer_tendance(self, resume):
         """Retourne True si la tendance est haussière, False sinon."""
         try:
-            mm20 = historique['Close'].rolling(window=20).mean()
-            if len(mm20) < 5:
+            # Comparaison de la MM20 actuelle avec celle d'il y a 4 séances
+            if resume['mm20'] is None:
                 logger.warning("Pas assez de données de tendance")
                 return False
-            return bool(mm20.iloc[-1] > mm20.iloc[-5])
+            return bool(resume['mm20'] > resume['mm20_precedente'])
         except Exception as e:
             logger.error("Erreur lors du calcul de la tendance: %s", e)
             return False
 
-    def calculer_prix_vente_cible(self, historique):
+    def calculer_prix_vente_cible(self, resume):
         """Calcule un prix de vente conseillé selon la méthode d'analyzer.py.
         Retourne un tuple (prix, raison) où raison décrit la cause si le prix
         ne peut pas être calculé."""
         try:
-            if len(historique) < 252:
+            if resume['moyenne_12m'] is None:
                 msg = "Données insuffisantes pour calculer le prix de vente"
                 logger.warning(msg)
                 return None, msg
 
-            tendance_3m = historique['Close'].tail(90).mean()
-            tendance_6m = historique['Close'].tail(180).mean()
-            tendance_12m = historique['Close'].tail(252).mean()
+            tendance_3m = resume['moyenne_3m']
+            tendance_6m = resume['moyenne_6m']
+            tendance_12m = resume['moyenne_12m']
 
-            if any(pd.isna(x) for x in [tendance_3m, tendance_6m, tendance_12m]):
+            if np.isnan([tendance_3m, tendance_6m, tendance_12m]).any():
                 msg = "Tendances NaN rencontrées pour le prix de vente"
                 logger.warning(msg)
                 return None, msg
 
             prix_cible = (tendance_3m * 0.5 + tendance_6m * 0.3 + tendance_12m * 0.2)
-            volatilite = historique['Close'].tail(30).pct_change().std()
-            if pd.isna(volatilite):
+            volatilite = resume['volatilite_30j']
+            if np.isnan(volatilite):
                 msg = "Volatilité NaN pour le prix de vente"
                 logger.warning(msg)
                 return None, msg
 
-            dernier_prix = historique['Close'].iloc[-1]
+            dernier_prix = resume['dernier']
             prix_final = prix_cible * (1 + volatilite)
             if prix_final <= dernier_prix:
                 msg = "Prix final inférieur ou égal au cours actuel"
@@ -139,12 +329,12 @@ class PortfolioAnalyzer:
             logger.error(msg)
             return None, msg
 
-    def calculer_stop_loss(self, prix_achat, historique):
+    def calculer_stop_loss(self, prix_achat, resume):
         """Calcule le stop loss en suivant les règles d'analyzer.py."""
         try:
             base_stop = prix_achat * (1 - CFG.get('stop_loss_percent', 5) / 100)
-            support = historique['Close'].rolling(window=20).min().iloc[-1]
-            if support > base_stop:
+            support = resume['support_20j']
+            if support is not None and support > base_stop:
                 return float(support * 0.995)
             return float(base_stop)
         except Exception as e:
@@ -152,52 +342,137 @@ class PortfolioAnalyzer:
             return float(base_stop)
 
     def load_config(self, config_file='config.yaml'):
-        """Charge la configuration depuis le fichier YAML."""
+        """Charge la configuration depuis le fichier YAML.
+
+        Le fichier par défaut est déjà chargé à l'import dans ``CFG`` : il
+        n'est relu que si ce premier chargement a échoué.
+        """
         if not os.path.isabs(config_file):
             config_file = os.path.join(BASE_DIR, config_file)
+        if config_file == CONFIG_FILE and CFG:
+            return CFG
         with open(config_file, 'r') as f:
-            return yaml.safe_load(f)
+            return yaml.load(f, Loader=_YamlLoader)
 
-    def get_stock_analysis(self, symbol, purchase_info, periods):
-        """Analyse une action et retourne ses variations sur différentes périodes."""
-        try:
-            proxy = set_random_proxy()
+    def _download_lot(self, lot, start_date, end_date):
+        """Télécharge l'historique d'un lot de symboles avec la session partagée."""
+        session = get_session()
+        proxy = set_random_proxy(session)
+        if logger.isEnabledFor(logging.INFO):
             if proxy:
-                logger.info(f"Proxy utilisé pour {symbol}: {proxy}")
-            stock = yf.Ticker(symbol, session=SESSION)
-            end_date = datetime.now()
+                logger.info("Proxy utilisé pour %s: %s", ', '.join(lot), proxy)
+            logger.info(
+                "Téléchargement groupé de %d symboles de %s à %s",
+                len(lot), start_date.date(), end_date.date()
+            )
+        data = yf.download(
+            lot, start=start_date, end=end_date, group_by='ticker',
+            auto_adjust=True, threads=True, progress=False, session=session
+        )
+        return {symbol: _extraire_historique(data, symbol) for symbol in lot}
 
-            purchase_date = datetime.strptime(purchase_info['purchase_date'], '%Y-%m-%d')
-            max_period = max(periods)
-            start_date = min(purchase_date, end_date - timedelta(days=max_period))
+    def download_histories(self, symbols, start_date, end_date):
+        """Télécharge l'historique de plusieurs symboles en requêtes groupées.
+        Retourne un dictionnaire {symbole: DataFrame}.
 
-            logger.info(f"Téléchargement des données récentes pour {symbol}")
+        Les lots sont téléchargés l'un après l'autre : yf.download partage un
+        état global entre ses appels et n'est pas sûr entre threads ; avec
+        ``threads=True``, chaque appel parallélise déjà ses requêtes."""
+        histories = {}
+        for lot in _par_lots(symbols, YF_BATCH_SIZE):
             try:
-                hist_recent = stock.history(period="2d")
-                logger.info(f"{len(hist_recent)} lignes reçues pour les données récentes de {symbol}")
+                result = self._download_lot(lot, start_date, end_date)
             except Exception as e:
-                logger.error(f"Erreur lors du téléchargement des données récentes pour {symbol}: {e}", exc_info=True)
-                return None
+                logger.error("Erreur lors du téléchargement groupé pour %s: %s", ', '.join(lot), e, exc_info=True)
+                continue
+            for symbol, hist in result.items():
+                logger.info("%d lignes reçues pour l'historique de %s", len(hist), symbol)
+                histories[symbol] = hist
+        return histories
+
+    def load_histories(self, symbols, start_date, end_date, cache_key=None):
+        """Retourne l'historique de chaque symbole en s'appuyant sur le cache
+        disque : seules les séances postérieures à la dernière clôture connue
+        sont téléchargées pour les symboles déjà en cache.
+
+        ``cache_key`` permet de partager le cache d'une fenêtre glissante d'un
+        jour sur l'autre ; les séances antérieures à ``start_date`` en sont
+        retirées."""
+        if cache_key is None:
+            cache_key = f"since_{start_date:%Y%m%d}"
+
+        def lire(symbol):
+            hist = load_cached_data(symbol, cache_key, max_age=HISTORY_CACHE_MAX_AGE)
+            if hist is not None:
+                hist = hist[hist.index >= start_date]
+            return hist
+
+        # Lectures et écritures du cache sont exécutées en parallèle ; les
+        # téléchargements restent séquentiels
+        with ThreadPoolExecutor(max_workers=MAX_DOWNLOAD_WORKERS) as executor:
+            cached = {
+                symbol: hist
+                for symbol, hist in zip(symbols, executor.map(lire, symbols))
+                if hist is not None and not hist.empty
+            }
 
-            logger.info(f"Téléchargement de l'historique complet pour {symbol} de {start_date.date()} à {end_date.date()}")
-            try:
-                hist = stock.history(start=start_date, end=end_date)
-                logger.info(f"{len(hist)} lignes reçues pour l'historique complet de {symbol}")
-            except Exception as e:
-                logger.error(f"Erreur lors du téléchargement de l'historique pour {symbol}: {e}", exc_info=True)
+            # Historiques complets puis mises à jour incrémentales : jamais
+            # deux appels à yf.download en même temps (état global partagé)
+            missing = [symbol for symbol in symbols if symbol not in cached]
+            histories = self.download_histories(missing, start_date, end_date)
+            a_sauver = dict(histories)
+            deltas = {}
+            if cached:
+                # La dernière séance connue est toujours retéléchargée : elle
+                # peut avoir été mise en cache avant la clôture
+                delta_start = min(hist.index[-1] for hist in cached.values())
+                deltas = self.download_histories(list(cached), delta_start, end_date)
+
+            for symbol, hist in cached.items():
+                delta = deltas.get(symbol)
+                if delta is not None and not delta.empty:
+                    taille = len(hist)
+                    hist = pd.concat([hist, delta]).sort_index()
+                    hist = hist[~hist.index.duplicated(keep='last')]
+                    # Sans nouvelle séance, le fichier en cache est conservé
+                    # tel quel pour ne pas rajeunir sa date de modification
+                    if len(hist) > taille:
+                        a_sauver[symbol] = hist
+                histories[symbol] = hist
+
+            for symbol, hist in a_sauver.items():
+                if not hist.empty:
+                    executor.submit(save_to_cache, symbol, cache_key, hist)
+        return histories
+
+    def get_stock_analysis(self, symbol, purchase_info, periods, closes):
+        """Analyse une action à partir de ses cours de clôture déjà téléchargés
+        (tableau NumPy, voir ``_extraire_clotures``) et retourne ses variations
+        sur différentes périodes."""
+        try:
+            purchase_date = datetime.fromisoformat(purchase_info['purchase_date'])
+
+            if closes is None:
+                logger.warning("Pas de données historiques pour %s", symbol)
                 return None
 
-            if hist.empty:
-                logger.warning(f"Pas de données historiques pour {symbol}")
+            if closes.size == 0:
+                logger.warning("Pas de cours de clôture pour %s", symbol)
                 return None
-            
-            current_price = hist['Close'].iloc[-1]
+
+            resume = _resumer_cours(closes)
+            current_price = resume['dernier']
             purchase_price = purchase_info['purchase_price']
 
-            tendance_bool = self.calculer_tendance(hist)
+            tendance_bool = self.calculer_tendance(resume)
             tendance = "Haussi\u00e8re" if tendance_bool else "Baissi\u00e8re"
-            prix_vente, raison_vente = self.calculer_prix_vente_cible(hist)
-            stop_loss = self.calculer_stop_loss(purchase_price, hist)
+            if len(closes) >= SEANCES_LONG_TERME:
+                prix_vente, raison_vente = self.calculer_prix_vente_cible(resume)
+            else:
+                raison_vente = "Données insuffisantes pour calculer le prix de vente"
+                logger.warning(raison_vente)
+                prix_vente = None
+            stop_loss = self.calculer_stop_loss(purchase_price, resume)
 
             analysis = {
                 'current_price': current_price,
@@ -210,33 +485,32 @@ class PortfolioAnalyzer:
                 'total_gain_loss': (current_price - purchase_price) * purchase_info['quantity'],
                 'purchase_variation': ((current_price - purchase_price) / purchase_price) * 100,
                 'trend': tendance,
+                'trend_up': tendance_bool,
                 'sell_price': prix_vente,
                 'sell_price_reason': raison_vente,
                 'stop_loss': stop_loss
             }
 
-            # Calculer explicitement la variation sur 1 jour
-            if len(hist_recent) >= 2:
-                yesterday_price = hist_recent['Close'].iloc[-2]
-                today_price = hist_recent['Close'].iloc[-1]
-                daily_variation = ((today_price - yesterday_price) / yesterday_price) * 100
+            # Calculer explicitement la variation sur 1 jour à partir des deux
+            # dernières clôtures de l'historique
+            if len(closes) >= 2:
+                yesterday_price = closes[-2]
+                daily_variation = ((current_price - yesterday_price) / yesterday_price) * 100
                 analysis['variations'][1] = daily_variation
             else:
-                msg = f"Impossible de calculer la variation quotidienne pour {symbol}, données insuffisantes"
-                logger.warning(msg)
+                logger.warning("Impossible de calculer la variation quotidienne pour %s, données insuffisantes", symbol)
                 analysis['variations'][1] = 0.0  # Valeur par défaut
 
-            # Calculer les autres périodes
-            for period in periods:
-                if period == 1:
-                    continue  # Déjà traité ci-dessus
-                if len(hist) >= period:
-                    old_price = hist['Close'].iloc[-period]
-                    variation = ((current_price - old_price) / old_price) * 100
-                    analysis['variations'][period] = variation
-                else:
-                    logger.warning("Période %d jours non disponible pour %s", period, symbol)
-                    analysis['variations'][period] = 0.0  # Valeur par défaut
+            # Calculer les autres périodes en une seule indexation vectorisée ;
+            # les périodes plus longues que l'historique valent 0 par défaut
+            autres_periodes = np.asarray([p for p in periods if p != 1], dtype=np.int64)
+            disponibles = autres_periodes <= closes.size
+            anciens_prix = closes[-autres_periodes[disponibles]]
+            variations = np.zeros(autres_periodes.size)
+            variations[disponibles] = (current_price - anciens_prix) / anciens_prix * 100.0
+            for period in autres_periodes[~disponibles].tolist():
+                logger.warning("Période %d jours non disponible pour %s", period, symbol)
+            analysis['variations'].update(zip(autres_periodes.tolist(), variations.tolist()))
 
             return analysis
         except Exception as e:
@@ -248,10 +522,29 @@ class PortfolioAnalyzer:
         """Analyse l'ensemble du portefeuille."""
         config = self.load_config()
         portfolio_data = []
-        periods = [1, 90, 180]
+        periods = list(VARIATION_PERIODS)
+
+        arrays = PortfolioArrays.from_config(config['portfolio'])
+        self.arrays = arrays
+
+        # Historique limité aux séances réellement utilisées : les variations
+        # et la moyenne 12 mois, indépendamment de la date d'achat
+        end_date = datetime.now()
+        seances = max(max(periods), SEANCES_LONG_TERME)
+        # Conversion en jours calendaires, avec une marge pour les jours fériés
+        jours = seances * 365 // 252 + 15
+        start_date = end_date - timedelta(days=jours)
+        symbols = list(dict.fromkeys(arrays.symbols))
+        histories = self.load_histories(
+            symbols, start_date, end_date, cache_key=f"{jours}j"
+        )
+        # Seules les clôtures sont utilisées : les DataFrames sont libérés
+        # dès la conversion
+        clotures = {symbol: _extraire_clotures(hist) for symbol, hist in histories.items()}
+        del histories
 
         logger.info("Analyse du portefeuille...")
-        for stock in config['portfolio']:
+        for i, stock in enumerate(config['portfolio']):
             logger.info("Analyse de %s...", stock['symbol'])
             purchase_info = {
                 'purchase_price': stock['purchase_price'],
@@ -259,7 +552,9 @@ class PortfolioAnalyzer:
                 'quantity': stock['quantity']
             }
 
-            analysis = self.get_stock_analysis(stock['symbol'], purchase_info, periods)
+            analysis = self.get_stock_analysis(
+                stock['symbol'], purchase_info, periods, clotures.get(stock['symbol'])
+            )
             if analysis:
                 stock_data = {
                     'symbol': stock['symbol'],
@@ -268,79 +563,256 @@ class PortfolioAnalyzer:
                     'purchase_price': analysis['purchase_price'],
                     'purchase_date': analysis['purchase_date'],
                     'quantity': analysis['quantity'],
-                    'variations': analysis['variations'],
+                    **{
+                        cle: analysis['variations'].get(period, 0)
+                        for cle, period in zip(VARIATION_KEYS, VARIATION_PERIODS)
+                    },
                     'total_value': analysis['total_value'],
                     'total_cost': analysis['total_cost'],
                     'total_gain_loss': analysis['total_gain_loss'],
                     'purchase_variation': analysis['purchase_variation'],
                     'trend': analysis['trend'],
+                    'trend_up': analysis['trend_up'],
                     'sell_price': analysis['sell_price'],
                     'sell_price_reason': analysis['sell_price_reason'],
                     'stop_loss': analysis['stop_loss'],
                 }
                 portfolio_data.append(stock_data)
+                arrays.current_px[i] = analysis['current_price']
+                arrays.variations[i] = _ligne_variations(stock_data)
                 logger.info("%s analysé avec succès", stock['symbol'])
             else:
-                msg = f"Impossible d'analyser {stock['symbol']}"
-                logger.warning(msg)
+                logger.warning("Impossible d'analyser %s", stock['symbol'])
 
         return portfolio_data, config
 
+
+# Noms des mois en français, indépendants de la locale du système
+_MOIS = (
+    'janvier', 'février', 'mars', 'avril', 'mai', 'juin',
+    'juillet', 'août', 'septembre', 'octobre', 'novembre', 'décembre',
+)
+
+
+def _horodatage(moment):
+    """Formate une date sous la forme « 14 octobre 2026 à 09:30 »."""
+    return f"{moment.day:02d} {_MOIS[moment.month - 1]} {moment.year} à {moment:%H:%M}"
+
+
+# Styles inline du rapport HTML, construits une seule fois à l'import
+_CONTAINER_STYLE = """
+    font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
+    max-width: 1100px;
+    margin: 0 auto;
+    padding: 40px 20px;
+    background-color: #f1f3f5;
+"""
+
+_HEADER_STYLE = """
+    background: linear-gradient(135deg, #1e3c72 0%, #2a5298 100%);
+    color: white;
+    padding: 35px;
+    border-radius: 12px;
+    margin-bottom: 30px;
+    text-align: center;
+"""
+
+_SUMMARY_STYLE = """
+    display: grid;
+    grid-template-columns: repeat(auto-fit, minmax(240px, 1fr));
+    gap: 20px;
+    margin-bottom: 40px;
+"""
+
+_SUMMARY_ITEM_STYLE = """
+    background: white;
+    padding: 25px;
+    border-radius: 12px;
+    box-shadow: 0 2px 8px rgba(0, 0, 0, 0.08);
+    border: 1px solid #e0e4e8;
+"""
+
+_TABLE_STYLE = """
+    width: 100%;
+    border-collapse: collapse;
+    margin: 30px 0;
+    background: white;
+    box-shadow: 0 4px 16px rgba(0, 0, 0, 0.1);
+    border-radius: 12px;
+    border: 1px solid #e0e4e8;
+"""
+
+_TH_STYLE = """
+    background: linear-gradient(to bottom, #f8f9fa, #f1f3f5);
+    color: #2c3e50;
+    font-weight: 600;
+    text-transform: uppercase;
+    font-size: 12px;
+    letter-spacing: 0.5px;
+    padding: 20px 16px;
+    text-align: left;
+    border-bottom: 2px solid #e9ecef;
+"""
+
+_TD_STYLE = """
+    padding: 16px;
+    border-bottom: 1px solid #e9ecef;
+    font-size: 14px;
+    vertical-align: middle;
+"""
+
+_VARIATION_BASE_STYLE = """
+    font-weight: 600;
+    padding: 8px 12px;
+    border-radius: 6px;
+    display: inline-block;
+    min-width: 95px;
+    text-align: right;
+    font-family: monospace;
+    font-size: 13px;
+"""
+
+_VAR_POS_STYLE = _VARIATION_BASE_STYLE + """
+    color: #059669;
+    background-color: #ecfdf5;
+    border: 1px solid #a7f3d0;
+"""
+
+_VAR_NEG_STYLE = _VARIATION_BASE_STYLE + """
+    color: #dc2626;
+    background-color: #fef2f2;
+    border: 1px solid #fecaca;
+"""
+
+_VAR_NEU_STYLE = _VARIATION_BASE_STYLE + """
+    color: #0284c7;
+    background-color: #f0f9ff;
+    border: 1px solid #bae6fd;
+"""
+
+_TREND_BASE_STYLE = """
+    font-weight: 600;
+    padding: 8px 16px;
+    border-radius: 6px;
+    text-transform: uppercase;
+    font-size: 12px;
+    letter-spacing: 0.5px;
+    display: inline-block;
+"""
+
+_TREND_UP_STYLE = _TREND_BASE_STYLE + """
+    background-color: #dcfce7;
+    color: #059669;
+    border: 1px solid #a7f3d0;
+"""
+
+_TREND_DOWN_STYLE = _TREND_BASE_STYLE + """
+    background-color: #fee2e2;
+    color: #dc2626;
+    border: 1px solid #fecaca;
+"""
+
+_TABLE_HEADER = f"""
+    <table style="{_TABLE_STYLE}">
+        <thead>
+            <tr>
+                <th style="{_TH_STYLE}">Action</th>
+                <th style="{_TH_STYLE} text-align: right;">Prix Actuel</th>
+                <th style="{_TH_STYLE} text-align: right;">1J</th>
+                <th style="{_TH_STYLE} text-align: right;">3M</th>
+                <th style="{_TH_STYLE} text-align: right;">6M</th>
+                <th style="{_TH_STYLE} text-align: right;">Depuis Achat</th>
+                <th style="{_TH_STYLE} text-align: right;">Gain/Perte</th>
+                <th style="{_TH_STYLE} text-align: center;">Tendance</th>
+                <th style="{_TH_STYLE} text-align: right;">Cible Vente</th>
+                <th style="{_TH_STYLE} text-align: right;">Stop Loss</th>
+            </tr>
+        </thead>
+        <tbody>
+"""
+
+_TABLE_FOOTER = """
+        </tbody>
+    </table>
+"""
+
+# Gabarit d'une ligne du tableau ; les styles constants y sont déjà insérés
+_ROW_TEMPLATE = """
+    <tr style="border-bottom: 1px solid #e9ecef;">
+        <td style="{td_style}">
+            <div style="font-weight: 600; color: #1a1a1a; font-size: 14px;">{{name}}</div>
+            <div style="color: #666; font-size: 13px;">{{symbol}}</div>
+        </td>
+        <td style="{td_style} text-align: right; font-family: monospace;">{{current_price}}</td>
+        <td style="{td_style}">
+            <div style="{{var_1d_style}}">{{var_1d_pct}}</div>
+        </td>
+        <td style="{td_style}">
+            <div style="{{var_3m_style}}">{{var_3m_pct}}</div>
+        </td>
+        <td style="{td_style}">
+            <div style="{{var_6m_style}}">{{var_6m_pct}}</div>
+        </td>
+        <td style="{td_style}">
+            <div style="{{purchase_variation_style}}">{{purchase_variation_pct}}</div>
+        </td>
+        <td style="{td_style} text-align: right; font-family: monospace; {{gain_loss_color}}">
+            {{total_gain_loss}}
+        </td>
+        <td style="{td_style} text-align: center;">
+            <div style="{{trend_style}}">
+                {{trend}}
+            </div>
+        </td>
+        <td style="{td_style} text-align: right; font-family: monospace;">
+            {{sell_price}}
+        </td>
+        <td style="{td_style} text-align: right; font-family: monospace;">
+            {{stop_loss}}
+        </td>
+    </tr>
+""".format(td_style=_TD_STYLE)
+_render_row = _ROW_TEMPLATE.format
+
+
+# Styles des variations indexés par le signe entier (1, -1 ou 0) : l'indice
+# -1 désigne le style négatif
+_VAR_STYLE_TABLE = np.array([_VAR_NEU_STYLE, _VAR_POS_STYLE, _VAR_NEG_STYLE], dtype=object)
+
+
+# Style de la tendance indexé par le booléen « tendance haussière »
+_TREND_STYLES = {True: _TREND_UP_STYLE, False: _TREND_DOWN_STYLE}
+
+
 class HTMLReportGenerator:
     def __init__(self, utils=None):
         self.utils = utils or PortfolioUtils()
 
-    def generate_html_report(self, portfolio_data):
-        """Génère le rapport HTML avec styles inline."""
-        if not portfolio_data:
-            return self._generate_empty_report()
-
-        total_portfolio_value = sum(stock['total_value'] for stock in portfolio_data)
-        total_portfolio_cost = sum(stock['total_cost'] for stock in portfolio_data)
-        total_portfolio_gain = total_portfolio_value - total_portfolio_cost
-        total_portfolio_return = (total_portfolio_gain / total_portfolio_cost * 100) if total_portfolio_cost > 0 else 0.0
-
-        container_style = """
-            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
-            max-width: 1100px;
-            margin: 0 auto;
-            padding: 40px 20px;
-            background-color: #f1f3f5;
-        """
-
-        header_style = """
-            background: linear-gradient(135deg, #1e3c72 0%, #2a5298 100%);
-            color: white;
-            padding: 35px;
-            border-radius: 12px;
-            margin-bottom: 30px;
-            text-align: center;
-        """
+    def generate_html_report(self, portfolio_data, arrays=None):
+        """Génère le rapport HTML avec styles inline.
 
-        summary_style = """
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(240px, 1fr));
-            gap: 20px;
-            margin-bottom: 40px;
+        ``arrays`` est la version par colonnes du portefeuille produite par
+        ``PortfolioAnalyzer.analyze_portfolio`` ; à défaut, elle est
+        reconstruite à partir des lignes.
         """
+        if not portfolio_data:
+            return self._generate_empty_report()
 
-        summary_item_style = """
-            background: white;
-            padding: 25px;
-            border-radius: 12px;
-            box-shadow: 0 2px 8px rgba(0, 0, 0, 0.08);
-            border: 1px solid #e0e4e8;
-        """
+        if arrays is None:
+            arrays = PortfolioArrays.from_rows(portfolio_data)
+        (total_portfolio_value, total_portfolio_cost,
+         total_portfolio_gain, total_portfolio_return) = arrays.totals()
+        genere_le = _horodatage(datetime.now())
 
         return f"""
-        <div style="{container_style}">
-            <div style="{header_style}">
+        <div style="{_CONTAINER_STYLE}">
+            <div style="{_HEADER_STYLE}">
                 <h1 style="font-size: 24px; font-weight: 700; margin-bottom: 6px;">Rapport de Portefeuille</h1>
-                <p style="font-size: 16px; opacity: 0.9;">Généré le {datetime.now().strftime('%d %B %Y à %H:%M').lower()}</p>
+                <p style="font-size: 16px; opacity: 0.9;">Généré le {genere_le}</p>
             </div>
 
-            <div style="{summary_style}">
-                <div style="{summary_item_style}">
+            <div style="{_SUMMARY_STYLE}">
+                <div style="{_SUMMARY_ITEM_STYLE}">
                     <div style="font-size: 14px; text-transform: uppercase; letter-spacing: 0.5px; color: #666; margin-bottom: 12px; font-weight: 600;">
                         Valeur Totale
                     </div>
@@ -349,7 +821,7 @@ class HTMLReportGenerator:
                     </div>
                 </div>
 
-                <div style="{summary_item_style}">
+                <div style="{_SUMMARY_ITEM_STYLE}">
                     <div style="font-size: 14px; text-transform: uppercase; letter-spacing: 0.5px; color: #666; margin-bottom: 12px; font-weight: 600;">
                         Coût Total
                     </div>
@@ -358,7 +830,7 @@ class HTMLReportGenerator:
                     </div>
                 </div>
 
-                <div style="{summary_item_style}">
+                <div style="{_SUMMARY_ITEM_STYLE}">
                     <div style="font-size: 14px; text-transform: uppercase; letter-spacing: 0.5px; color: #666; margin-bottom: 12px; font-weight: 600;">
                         Gain/Perte Total
                     </div>
@@ -367,7 +839,7 @@ class HTMLReportGenerator:
                     </div>
                 </div>
 
-                <div style="{summary_item_style}">
+                <div style="{_SUMMARY_ITEM_STYLE}">
                     <div style="font-size: 14px; text-transform: uppercase; letter-spacing: 0.5px; color: #666; margin-bottom: 12px; font-weight: 600;">
                         Performance Globale
                     </div>
@@ -377,7 +849,7 @@ class HTMLReportGenerator:
                 </div>
             </div>
 
-            {self._generate_portfolio_table(portfolio_data)}
+            {self._generate_portfolio_table(portfolio_data, arrays)}
 
             <div style="margin-top: 40px; padding: 25px; background: white; border-radius: 12px; font-size: 13px; color: #666; text-align: center; border: 1px solid #e0e4e8; line-height: 1.6;">
                 <p>Ce rapport est généré automatiquement à partir des données de marché en temps réel.</p>
@@ -396,203 +868,91 @@ class HTMLReportGenerator:
         </div>
         """
 
-    def _generate_portfolio_table(self, portfolio_data):
+    def _generate_portfolio_table(self, portfolio_data, arrays=None):
         """Génère le tableau des actions du portefeuille."""
-        table_style = """
-            width: 100%;
-            border-collapse: collapse;
-            margin: 30px 0;
-            background: white;
-            box-shadow: 0 4px 16px rgba(0, 0, 0, 0.1);
-            border-radius: 12px;
-            border: 1px solid #e0e4e8;
-        """
+        utils = self.utils
+        format_percentage = utils.format_percentage
+        if arrays is None:
+            arrays = PortfolioArrays.from_rows(portfolio_data)
+
+        # Styles de toutes les cellules de variation en une seule passe
+        variations = arrays.variations[arrays.analysees()]
+        signes = np.sign(np.nan_to_num(variations)).astype(np.intp)
+        styles_matrice = _VAR_STYLE_TABLE[signes].tolist()
+
+        parts = [_TABLE_HEADER]
+        for stock, values, styles in zip(portfolio_data, variations.tolist(), styles_matrice):
+            pcts = tuple(map(format_percentage, values))
+
+            parts.append(_render_row(
+                name=html.escape(stock['name']),
+                symbol=html.escape(stock['symbol']),
+                current_price=utils.format_money(stock['current_price']),
+                var_1d_style=styles[0],
+                var_1d_pct=pcts[0],
+                var_3m_style=styles[1],
+                var_3m_pct=pcts[1],
+                var_6m_style=styles[2],
+                var_6m_pct=pcts[2],
+                purchase_variation_style=styles[3],
+                purchase_variation_pct=pcts[3],
+                gain_loss_color=utils.get_color_for_value(stock['total_gain_loss']),
+                total_gain_loss=utils.format_money(stock['total_gain_loss']),
+                trend_style=_TREND_STYLES[stock['trend_up']],
+                trend=html.escape(stock['trend']),
+                # La raison peut contenir le message d'une exception
+                sell_price=(
+                    utils.format_money(stock['sell_price'])
+                    if stock['sell_price'] is not None
+                    else html.escape(str(stock.get('sell_price_reason', 'N/A')))
+                ),
+                stop_loss=utils.format_money(stock['stop_loss']),
+            ))
+        parts.append(_TABLE_FOOTER)
+        return ''.join(parts)
+
+
+def connect_smtp(smtp_cfg):
+    """Ouvre une connexion SMTP chiffrée et authentifiée."""
+    host = smtp_cfg.get('host', 'smtp.gmail.com')
+    port = smtp_cfg.get('port', 587)
+    username = smtp_cfg.get('username')
+    password = smtp_cfg.get('password')
+
+    server = smtplib.SMTP(host, port)
+    try:
+        server.starttls()
+        if username and password:
+            server.login(username, password)
+    except Exception:
+        server.close()
+        raise
+    return server
 
-        th_style = """
-            background: linear-gradient(to bottom, #f8f9fa, #f1f3f5);
-            color: #2c3e50;
-            font-weight: 600;
-            text-transform: uppercase;
-            font-size: 12px;
-            letter-spacing: 0.5px;
-            padding: 20px 16px;
-            text-align: left;
-            border-bottom: 2px solid #e9ecef;
-        """
 
-        td_style = """
-            padding: 16px;
-            border-bottom: 1px solid #e9ecef;
-            font-size: 14px;
-            vertical-align: middle;
-        """
+def _fermer_smtp(server):
+    """Ferme proprement une connexion SMTP, même déjà rompue."""
+    try:
+        server.quit()
+    except (smtplib.SMTPException, OSError):
+        server.close()
 
-        variation_base_style = """
-            font-weight: 600;
-            padding: 8px 12px;
-            border-radius: 6px;
-            display: inline-block;
-            min-width: 95px;
-            text-align: right;
-            font-family: monospace;
-            font-size: 13px;
-        """
 
-        html = f"""
-            <table style="{table_style}">
-                <thead>
-                    <tr>
-                        <th style="{th_style}">Action</th>
-                        <th style="{th_style} text-align: right;">Prix Actuel</th>
-                        <th style="{th_style} text-align: right;">1J</th>
-                        <th style="{th_style} text-align: right;">3M</th>
-                        <th style="{th_style} text-align: right;">6M</th>
-                        <th style="{th_style} text-align: right;">Depuis Achat</th>
-                        <th style="{th_style} text-align: right;">Gain/Perte</th>
-                        <th style="{th_style} text-align: center;">Tendance</th>
-                        <th style="{th_style} text-align: right;">Cible Vente</th>
-                        <th style="{th_style} text-align: right;">Stop Loss</th>
-                    </tr>
-                </thead>
-                <tbody>
-        """
+def _abandonner_connexion(connection):
+    """Ferme la connexion SMTP anticipée lorsqu'aucun email n'est envoyé."""
+    def fermer(future):
+        if not future.cancelled() and future.exception() is None:
+            _fermer_smtp(future.result())
+    connection.add_done_callback(fermer)
 
-        for stock in portfolio_data:
-            var_1d = stock['variations'].get(1, 0)
-            var_3m = stock['variations'].get(90, 0)
-            var_6m = stock['variations'].get(180, 0)
-
-            # Définir les styles de variation en fonction des valeurs
-            def get_variation_style(value):
-                base = variation_base_style
-                if value > 0:
-                    return base + """
-                        color: #059669;
-                        background-color: #ecfdf5;
-                        border: 1px solid #a7f3d0;
-                    """
-                elif value < 0:
-                    return base + """
-                        color: #dc2626;
-                        background-color: #fef2f2;
-                        border: 1px solid #fecaca;
-                    """
-                return base + """
-                    color: #0284c7;
-                    background-color: #f0f9ff;
-                    border: 1px solid #bae6fd;
-                """
-
-            # Style pour la tendance haussière ou baissière
-            def get_trend_style(trend):
-                base = """
-                    font-weight: 600;
-                    padding: 8px 16px;
-                    border-radius: 6px;
-                    text-transform: uppercase;
-                    font-size: 12px;
-                    letter-spacing: 0.5px;
-                    display: inline-block;
-                """
-                if trend.lower().startswith('haussi'):
-                    return base + """
-                        background-color: #dcfce7;
-                        color: #059669;
-                        border: 1px solid #a7f3d0;
-                    """
-                else:
-                    return base + """
-                        background-color: #fee2e2;
-                        color: #dc2626;
-                        border: 1px solid #fecaca;
-                    """
-
-            html += f"""
-                <tr style="border-bottom: 1px solid #e9ecef;">
-                    <td style="{td_style}">
-                        <div style="font-weight: 600; color: #1a1a1a; font-size: 14px;">{stock['name']}</div>
-                        <div style="color: #666; font-size: 13px;">{stock['symbol']}</div>
-                    </td>
-                    <td style="{td_style} text-align: right; font-family: monospace;">{self.utils.format_money(stock['current_price'])}</td>
-                    <td style="{td_style}">
-                        <div style="{get_variation_style(var_1d)}">{self.utils.format_percentage(var_1d)}</div>
-                    </td>
-                    <td style="{td_style}">
-                        <div style="{get_variation_style(var_3m)}">{self.utils.format_percentage(var_3m)}</div>
-                    </td>
-                    <td style="{td_style}">
-                        <div style="{get_variation_style(var_6m)}">{self.utils.format_percentage(var_6m)}</div>
-                    </td>
-                    <td style="{td_style}">
-                        <div style="{get_variation_style(stock['purchase_variation'])}">{self.utils.format_percentage(stock['purchase_variation'])}</div>
-                    </td>
-                    <td style="{td_style} text-align: right; font-family: monospace; {self.utils.get_color_for_value(stock['total_gain_loss'])}">
-                        {self.utils.format_money(stock['total_gain_loss'])}
-                    </td>
-                    <td style="{td_style} text-align: center;">
-                        <div style="{get_trend_style(stock['trend'])}">
-                            {stock['trend']}
-                        </div>
-                    </td>
-                    <td style="{td_style} text-align: right; font-family: monospace;">
-                        {self.utils.format_money(stock['sell_price']) if stock['sell_price'] is not None else stock.get('sell_price_reason', 'N/A')}
-                    </td>
-                    <td style="{td_style} text-align: right; font-family: monospace;">
-                        {self.utils.format_money(stock['stop_loss'])}
-                    </td>
-                </tr>
-            """
-
-        html += """
-                </tbody>
-            </table>
-        """
-        return html
 
-    def _generate_stock_row(self, stock, var_1d, var_3m, var_6m):
-        """Génère une ligne du tableau pour une action."""
-        return f"""
-            <tr>
-                <td>
-                    <div class="stock-info">
-                        <span class="stock-name">{stock['name']}</span>
-                        <span class="stock-symbol">{stock['symbol']}</span>
-                    </div>
-                </td>
-                <td class="value-cell">{self.utils.format_money(stock['current_price'])}</td>
-                <td>
-                    <div class="variation {'positive' if var_1d > 0 else 'negative' if var_1d < 0 else 'neutral'}">
-                        {self.utils.format_percentage(var_1d)}
-                    </div>
-                </td>
-                <td>
-                    <div class="variation {'positive' if var_3m > 0 else 'negative' if var_3m < 0 else 'neutral'}">
-                        {self.utils.format_percentage(var_3m)}
-                    </div>
-                </td>
-                <td>
-                    <div class="variation {'positive' if var_6m > 0 else 'negative' if var_6m < 0 else 'neutral'}">
-                        {self.utils.format_percentage(var_6m)}
-                    </div>
-                </td>
-                <td>
-                    <div class="variation {'positive' if stock['purchase_variation'] > 0 else 'negative' if stock['purchase_variation'] < 0 else 'neutral'}">
-                        {self.utils.format_percentage(stock['purchase_variation'])}
-                    </div>
-                </td>
-                <td class="value-cell" style="color: {self.utils.get_color_for_value(stock['total_gain_loss'])}">
-                    {self.utils.format_money(stock['total_gain_loss'])}
-                </td>
-                <td style="text-align: center">
-                    <div class="trend {stock['trend'].lower()}">{stock['trend']}</div>
-                </td>
-                <td class="value-cell">{self.utils.format_money(stock['sell_price']) if stock['sell_price'] is not None else stock.get('sell_price_reason', 'N/A')}</td>
-                <td class="value-cell">{self.utils.format_money(stock['stop_loss'])}</td>
-            </tr>
-        """
+def send_email(from_email, to_email, subject, html_content, smtp_cfg, connection=None):
+    """Envoie le rapport par email via SMTP.
 
-def send_email(from_email, to_email, subject, html_content, smtp_cfg):
-    """Envoie le rapport par email via SMTP."""
+    ``connection`` est un Future renvoyant une connexion ouverte à l'avance
+    par ``connect_smtp`` ; si elle a échoué ou a été coupée entre-temps, une
+    nouvelle connexion est ouverte.
+    """
     try:
         msg = MIMEMultipart('alternative')
         msg['Subject'] = subject
@@ -600,16 +960,25 @@ def send_email(from_email, to_email, subject, html_content, smtp_cfg):
         msg['To'] = to_email
         msg.attach(MIMEText(html_content, 'html'))
 
-        host = smtp_cfg.get('host', 'smtp.gmail.com')
-        port = smtp_cfg.get('port', 587)
-        username = smtp_cfg.get('username')
-        password = smtp_cfg.get('password')
+        server = None
+        if connection is not None:
+            try:
+                server = connection.result()
+            except Exception as e:
+                logger.warning("Connexion SMTP anticipée impossible: %s", e)
 
-        with smtplib.SMTP(host, port) as server:
-            server.starttls()
-            if username and password:
-                server.login(username, password)
-            server.sendmail(from_email, [to_email], msg.as_string())
+        if server is None:
+            server = connect_smtp(smtp_cfg)
+        try:
+            try:
+                server.sendmail(from_email, [to_email], msg.as_string())
+            except smtplib.SMTPServerDisconnected:
+                logger.warning("Connexion SMTP interrompue, nouvelle tentative")
+                _fermer_smtp(server)
+                server = connect_smtp(smtp_cfg)
+                server.sendmail(from_email, [to_email], msg.as_string())
+        finally:
+            _fermer_smtp(server)
         return True
     except Exception as e:
         logger.error("Erreur lors de l'envoi de l'email: %s", str(e))
@@ -622,23 +991,35 @@ def main():
         analyzer = PortfolioAnalyzer(utils)
         report_generator = HTMLReportGenerator(utils)
 
-        portfolio_data, config = analyzer.analyze_portfolio()
-
-        if not portfolio_data:
-            logger.error("Aucune donnée de portefeuille n'a pu être récupérée !")
-            return
-
-        logger.info("Génération du rapport...")
-        html_report = report_generator.generate_html_report(portfolio_data)
+        # La connexion SMTP (TLS + authentification) est établie pendant
+        # l'analyse du portefeuille plutôt qu'après la génération du rapport
+        smtp_cfg = analyzer.load_config().get('email', {}).get('smtp', {})
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            connection = executor.submit(connect_smtp, smtp_cfg)
 
-        logger.info("Envoi du rapport par email...")
-        success = send_email(
-            config['email']['from'],
-            config['email']['to'],
-            "Rapport quotidien de portefeuille",
-            html_report,
-            config['email'].get('smtp', {})
-        )
+            try:
+                portfolio_data, config = analyzer.analyze_portfolio()
+            except Exception:
+                _abandonner_connexion(connection)
+                raise
+
+            if not portfolio_data:
+                logger.error("Aucune donnée de portefeuille n'a pu être récupérée !")
+                _abandonner_connexion(connection)
+                return
+
+            logger.info("Génération du rapport...")
+            html_report = report_generator.generate_html_report(portfolio_data, analyzer.arrays)
+
+            logger.info("Envoi du rapport par email...")
+            success = send_email(
+                config['email']['from'],
+                config['email']['to'],
+                "Rapport quotidien de portefeuille",
+                html_report,
+                config['email'].get('smtp', {}),
+                connection=connection,
+            )
 
         if success:
             logger.info("Rapport envoyé avec succès")
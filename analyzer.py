@@ -2,6 +2,10 @@
 
 import os
 import yfinance as yf
+try:
+    from yfinance import shared as _yf_shared
+except ImportError:
+    _yf_shared = None
 import pandas as pd
 import numpy as np
 import concurrent.futures
@@ -13,10 +17,16 @@ import random
 from datetime import datetime
 import logging
 import sys
+import threading
+import time
+import urllib.parse
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 from template_mail import RapportHTML
-from cache_utils import load_cached_data, save_to_cache
+from tickers import TICKERS_EUROPE
+from cache_utils import (
+    downcast_ohlcv, load_cached_data, save_to_cache, load_cached_json, save_json_to_cache
+)
 # Utilisation de curl_cffi pour contourner les limitations de Yahoo Finance
 # cf. https://github.com/ranaroussi/yfinance/issues/2422#issuecomment-2840774505
 from curl_cffi import requests
@@ -33,11 +43,17 @@ if not logger.handlers:
     logger.addHandler(handler)
 logger.propagate = False
 
+# Chargeur YAML basé sur libyaml lorsqu'il est disponible
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
 # Chargement de la configuration externe
 CONFIG_FILE = os.path.join(BASE_DIR, 'config.yaml')
 try:
     with open(CONFIG_FILE, 'r') as f:
-        cfg = yaml.safe_load(f)
+        cfg = yaml.load(f, Loader=_YamlLoader)
 except Exception as e:
     logger.error(f"Erreur lors du chargement du fichier de configuration: {e}")
     cfg = {}
@@ -51,26 +67,57 @@ PROXIES = cfg.get('proxies', [
 # Possibilité de désactiver complètement l'utilisation des proxies
 USE_PROXIES = cfg.get('use_proxies', True)
 
-# Session HTTP global impersonant Chrome pour contourner les blocages
-SESSION = requests.Session(impersonate="chrome")
+# Sessions HTTP impersonant Chrome, créées à la demande : une par proxy afin
+# que chacune conserve ses connexions ouvertes. La session sans proxy ignore
+# les variables d'environnement HTTP(S)_PROXY du système.
+_SESSIONS = {}
+_SESSIONS_LOCK = threading.Lock()
 yfinance_cookie_patch.patch_yfdata_cookie_basic()
 
 
+def get_session(proxy=None):
+    """Retourne la session HTTP dédiée au proxy donné (None : connexion directe)"""
+    with _SESSIONS_LOCK:
+        session = _SESSIONS.get(proxy)
+        if session is None:
+            if proxy:
+                session = requests.Session(impersonate="chrome")
+                session.proxies = {"http": proxy, "https": proxy}
+            else:
+                session = requests.Session(impersonate="chrome", trust_env=False)
+            _SESSIONS[proxy] = session
+        return session
+
+
+# Session sans proxy, conservée pour les appels qui n'en choisissent pas
+SESSION = get_session()
+
+
 def set_random_proxy():
-    """Choisit un proxy aléatoirement et le définit pour les requêtes"""
+    """Choisit un proxy aléatoirement et retourne (session, proxy) ; le proxy
+    vaut None lorsque leur utilisation est désactivée"""
+    # USE_PROXIES est relu à chaque appel : evaluate_stock le désactive après l'import
     if not USE_PROXIES:
-        # Remove any proxy environment variables that might be set globally
-        for var in ["HTTP_PROXY", "HTTPS_PROXY", "http_proxy", "https_proxy"]:
-            os.environ.pop(var, None)
-        SESSION.proxies.clear()
-        return None
+        return SESSION, None
 
     proxy = random.choice(PROXIES)
-    os.environ["HTTP_PROXY"] = proxy
-    os.environ["HTTPS_PROXY"] = proxy
-    # Mise à jour de la session globale
-    SESSION.proxies.update({"http": proxy, "https": proxy})
-    return proxy
+    return get_session(proxy), proxy
+
+
+# Objets yf.Ticker déjà construits, indexés par (ticker, proxy) : chaque
+# objet reste lié à la session de son proxy
+TICKER_CACHE = {}
+_TICKER_CACHE_LOCK = threading.Lock()
+
+
+def get_ticker(ticker, proxy=None):
+    """Retourne l'objet yf.Ticker du ticker pour le proxy donné, créé une seule fois"""
+    cle = (ticker, proxy)
+    with _TICKER_CACHE_LOCK:
+        action = TICKER_CACHE.get(cle)
+        if action is None:
+            action = TICKER_CACHE[cle] = yf.Ticker(ticker, session=get_session(proxy))
+        return action
 
 # Configuration SMTP et emails
 email_cfg = cfg.get('email', {}) if isinstance(cfg, dict) else {}
@@ -109,18 +156,304 @@ SIGNAL_WEIGHTS = {
     'BougiesVertes': signal_weights_cfg.get('BougiesVertes', 1.0),
 }
 
+# Signaux attendus, dans leur ordre d'affichage
+_ORDRE_SIGNAUX = (
+    'MACD', 'MM_20_50', 'MM_50_200', 'RSI',
+    'Tendance', 'Bollinger', 'PEG',
+    'PriceBook', 'ROE',
+    'Volume', 'Momentum', 'Breakout', 'BougiesVertes'
+)
+_EXPECTED_SIGNALS = frozenset(_ORDRE_SIGNAUX)
+# Signaux nécessitant les données fondamentales (requête ``info``)
+_SIGNAUX_FONDAMENTAUX = frozenset({'PEG', 'PriceBook', 'ROE'})
+# Seuls les indicateurs dont la pondération est strictement positive comptent
+_RELEVANT_SIGNALS = frozenset(
+    s for s in _EXPECTED_SIGNALS if SIGNAL_WEIGHTS.get(s, 1.0) > 0
+)
+# Pondération de chaque signal pris en compte
+_POIDS_SIGNAUX = {s: SIGNAL_WEIGHTS.get(s, 1.0) for s in _RELEVANT_SIGNALS}
+_TOTAL_POIDS = sum(_POIDS_SIGNAUX.values())
+# Poids maximal apporté par les signaux fondamentaux
+_POIDS_FONDAMENTAUX = sum(
+    _POIDS_SIGNAUX[s] for s in _RELEVANT_SIGNALS & _SIGNAUX_FONDAMENTAUX
+)
+
+# Tickers pour lesquels on ne calcule pas le ratio PEG
+TICKERS_SANS_PEG = frozenset({"FDJ.PA", "NOKIA.HE", "ABI.BR"})
+
+# Liens Yahoo Finance des tickers analysés, calculés une seule fois
+TICKER_URLS = {
+    ticker: f"https://finance.yahoo.com/quote/{urllib.parse.quote(ticker)}"
+    for ticker in TICKERS_EUROPE
+}
+
 # Pourcentage de perte acceptable pour calculer le stop loss
 STOP_LOSS_PERCENT = cfg.get('stop_loss_percent', 5)
 
+# Nombre maximal de tickers par requête groupée Yahoo Finance
+YF_BATCH_SIZE = 20
+# Threads utilisés pour relire les historiques depuis le cache disque
+CACHE_LOAD_WORKERS = 16
+
+# Nombre maximal de requêtes Yahoo Finance simultanées : l'analyse reste
+# parallélisée sur tous les threads, seul l'accès réseau est limité
+YF_MAX_REQUETES = 4
+YF_SEM = threading.BoundedSemaphore(YF_MAX_REQUETES)
+# Nombre de tentatives lorsque Yahoo Finance répond 429 (Too Many Requests)
+YF_MAX_TENTATIVES = 4
+# Un seul yf.download à la fois (état global partagé entre ses appels)
+_YF_DOWNLOAD_LOCK = threading.Lock()
+# Messages d'erreur de yf.download correspondant à une limitation de débit
+_MOTIFS_LIMITE = ('Too Many Requests', 'Rate limit', 'YFRateLimitError')
+
+# Historiques déjà chargés pendant l'exécution, indexés par (ticker, période)
+HIST_CACHE = {}
+# Dictionnaires ``info`` Yahoo Finance déjà récupérés, indexés par ticker
+INFO_CACHE = {}
+
+
+def reset_sessions():
+    """Oublie les sessions HTTP, objets yf.Ticker et verrous hérités du parent.
+
+    À appeler au démarrage d'un processus créé par fork : les sessions
+    copiées partagent les connexions ouvertes du processus parent.
+    """
+    global SESSION, _SESSIONS_LOCK, _TICKER_CACHE_LOCK, YF_SEM, _YF_DOWNLOAD_LOCK
+    _SESSIONS_LOCK = threading.Lock()
+    _TICKER_CACHE_LOCK = threading.Lock()
+    YF_SEM = threading.BoundedSemaphore(YF_MAX_REQUETES)
+    _YF_DOWNLOAD_LOCK = threading.Lock()
+    _SESSIONS.clear()
+    TICKER_CACHE.clear()
+    SESSION = get_session()
+
+
+def _est_limite_de_debit(erreur):
+    """Indique si l'exception correspond à une réponse HTTP 429 de Yahoo"""
+    reponse = getattr(erreur, 'response', None)
+    if getattr(reponse, 'status_code', None) == 429:
+        return True
+    return (
+        type(erreur).__name__ == 'YFRateLimitError'
+        or 'Too Many Requests' in str(erreur)
+    )
+
+
+def _appel_yahoo(fonction, *args, **kwargs):
+    """Exécute un appel réseau Yahoo Finance sous ``YF_SEM``.
+
+    En cas de limitation de débit (429), l'appel est retenté avec un délai
+    exponentiel aléatoire, sans conserver le sémaphore pendant l'attente.
+    """
+    for tentative in range(YF_MAX_TENTATIVES):
+        try:
+            with YF_SEM:
+                return fonction(*args, **kwargs)
+        except Exception as e:
+            if not _est_limite_de_debit(e) or tentative == YF_MAX_TENTATIVES - 1:
+                raise
+            delai = 2 ** tentative + random.random()
+            logger.warning(f"Limite de requêtes Yahoo atteinte, nouvelle tentative dans {delai:.1f}s")
+            time.sleep(delai)
+
+
+def get_info(ticker):
+    """Retourne le dictionnaire ``info`` d'un ticker, récupéré une seule fois.
+
+    Les données fondamentales évoluant au plus une fois par jour, elles sont
+    aussi conservées sur disque pendant 24 heures entre deux exécutions.
+    """
+    if ticker not in INFO_CACHE:
+        info = load_cached_json(ticker, 'info')
+        if info is None:
+            _, proxy = set_random_proxy()
+            if proxy:
+                logger.info(f"Proxy utilisé pour {ticker}: {proxy}")
+            info = _appel_yahoo(lambda: get_ticker(ticker, proxy).info)
+            if info:
+                save_json_to_cache(ticker, 'info', info)
+        INFO_CACHE[ticker] = info
+    return INFO_CACHE[ticker]
+
+
+def _extraire_historique(data, ticker):
+    """Extrait l'historique d'un ticker d'un DataFrame renvoyé par yf.download"""
+    if isinstance(data.columns, pd.MultiIndex):
+        if ticker not in data.columns.get_level_values(0):
+            return pd.DataFrame()
+        data = data[ticker]
+    return data.dropna(how='all')
+
+
+def _telecharger_lot(lot, period):
+    """Télécharge un lot de tickers avec yf.download.
+
+    yf.download partage un état global entre ses appels : un seul s'exécute
+    à la fois, et il occupe les ``YF_MAX_REQUETES`` places de ``YF_SEM``
+    puisqu'il lance lui-même autant de requêtes en parallèle. Retourne le
+    DataFrame et l'ensemble des tickers refusés pour limitation de débit.
+    """
+    session, proxy = set_random_proxy()
+    if proxy:
+        logger.info(f"Proxy utilisé pour le lot {', '.join(lot)}: {proxy}")
+    with _YF_DOWNLOAD_LOCK:
+        semaphore = YF_SEM
+        for _ in range(YF_MAX_REQUETES):
+            semaphore.acquire()
+        try:
+            # auto_adjust=True : mêmes cours ajustés que Ticker.history()
+            data = yf.download(
+                lot, period=period, group_by='ticker', auto_adjust=True,
+                threads=YF_MAX_REQUETES, progress=False, session=session
+            )
+            # yf.download consigne les échecs par ticker au lieu de lever
+            erreurs = dict(getattr(_yf_shared, '_ERRORS', None) or {})
+        finally:
+            for _ in range(YF_MAX_REQUETES):
+                semaphore.release()
+    limites = {
+        ticker for ticker in lot
+        if any(motif in str(erreurs.get(ticker.upper(), '')) for motif in _MOTIFS_LIMITE)
+    }
+    return data, limites
+
+
+def telecharger_historiques(tickers, period='1y'):
+    """Charge l'historique de plusieurs tickers en requêtes groupées.
+
+    Les historiques sont pris dans ``HIST_CACHE`` puis dans le cache disque ;
+    seuls les tickers restants sont téléchargés, par lots de ``YF_BATCH_SIZE``.
+    Retourne un dictionnaire {ticker: DataFrame} ne contenant que les tickers
+    effectivement chargés ; les autres sont laissés au repli ticker par
+    ticker (``Ticker.history()``).
+    """
+    a_charger = [t for t in dict.fromkeys(tickers) if (t, period) not in HIST_CACHE]
+    # Lecture des fichiers de cache en parallèle : l'E/S et le décodage
+    # libèrent le GIL
+    manquants = []
+    with concurrent.futures.ThreadPoolExecutor(max_workers=CACHE_LOAD_WORKERS) as executor:
+        charges = executor.map(lambda t: load_cached_data(t, period), a_charger)
+        for ticker, historique in zip(a_charger, charges):
+            if historique is not None:
+                HIST_CACHE[ticker, period] = historique
+            else:
+                manquants.append(ticker)
+
+    for i in range(0, len(manquants), YF_BATCH_SIZE):
+        lot = manquants[i:i + YF_BATCH_SIZE]
+        for tentative in range(YF_MAX_TENTATIVES):
+            derniere = tentative == YF_MAX_TENTATIVES - 1
+            try:
+                data, limites = _telecharger_lot(lot, period)
+            except Exception as e:
+                if _est_limite_de_debit(e) and not derniere:
+                    limites = set(lot)
+                else:
+                    logger.error(f"Erreur lors du téléchargement groupé pour {', '.join(lot)}: {e}", exc_info=True)
+                    break
+            else:
+                for ticker in lot:
+                    historique = _extraire_historique(data, ticker)
+                    if historique.empty and ticker in limites and not derniere:
+                        continue  # retenté au tour suivant
+                    if historique.empty:
+                        # Absent de HIST_CACHE : l'analyse se rabat sur
+                        # Ticker.history() pour ce ticker
+                        logger.warning(f"Aucune donnée groupée récupérée pour {ticker}")
+                        continue
+                    logger.info(f"{len(historique)} lignes téléchargées pour {ticker}")
+                    save_to_cache(ticker, period, historique)
+                    HIST_CACHE[ticker, period] = downcast_ohlcv(historique)
+
+            # Seuls les tickers refusés pour limitation de débit sont retentés
+            lot = [t for t in lot if (t, period) not in HIST_CACHE and t in limites]
+            if not lot or derniere:
+                break
+            delai = 2 ** tentative + random.random()
+            logger.warning(
+                f"Limite de requêtes Yahoo atteinte pour {', '.join(lot)}, "
+                f"nouvelle tentative dans {delai:.1f}s"
+            )
+            time.sleep(delai)
+
+    return {
+        ticker: HIST_CACHE[ticker, period]
+        for ticker in tickers if (ticker, period) in HIST_CACHE
+    }
+
+def _volatilite(clotures, fenetre=30):
+    """Écart-type des variations journalières sur les ``fenetre`` dernières
+    clôtures, équivalent à ``tail(fenetre).pct_change().std()`` ; les
+    variations touchant une clôture manquante sont ignorées."""
+    x = clotures[-fenetre:]
+    rendements = x[1:] / x[:-1] - 1
+    rendements = rendements[~np.isnan(rendements)]
+    return rendements.std(ddof=1) if rendements.size > 1 else np.nan
+
+
+def _cumuls(prix):
+    """Sommes cumulées (nombre de valeurs, somme, somme des carrés) d'une série
+    de prix, précédées d'un zéro ; les NaN sont ignorés. Les prix sont centrés
+    sur une valeur de référence pour limiter les erreurs d'arrondi. Retourne
+    aussi cette référence."""
+    x = prix.to_numpy(dtype=np.float64)
+    valides = ~np.isnan(x)
+    reference = x[valides][0] if valides.any() else 0.0
+    y = np.where(valides, x - reference, 0.0)
+    zero = np.zeros(1)
+    nombre = np.concatenate((zero, np.cumsum(valides)))
+    somme = np.concatenate((zero, np.cumsum(y)))
+    somme_carres = np.concatenate((zero, np.cumsum(y * y)))
+    return nombre, somme, somme_carres, reference
+
+
+def _glissant(cumul, fenetre):
+    """Total de chaque fenêtre glissante (tronquée en début de série) à partir
+    d'une somme cumulée produite par ``_cumuls``"""
+    fin = np.arange(1, cumul.size)
+    return cumul[fin] - cumul[np.maximum(fin - fenetre, 0)]
+
+
+def _moyenne_glissante(cumuls, fenetre, min_periods):
+    """Moyenne glissante équivalente à ``Series.rolling(fenetre, min_periods=min_periods).mean()``"""
+    nombre_c, somme_c, _, reference = cumuls
+    nombre = _glissant(nombre_c, fenetre)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        moyenne = _glissant(somme_c, fenetre) / nombre
+    return np.where(nombre >= max(min_periods, 1), moyenne + reference, np.nan)
+
+
+def _moyenne_ecart_type_glissants(cumuls, fenetre, min_periods):
+    """Moyenne et écart-type (ddof=1) glissants, équivalents à ceux de
+    ``Series.rolling(fenetre, min_periods=min_periods)``"""
+    nombre_c, somme_c, carres_c, reference = cumuls
+    nombre = _glissant(nombre_c, fenetre)
+    somme = _glissant(somme_c, fenetre)
+    carres = _glissant(carres_c, fenetre)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        moyenne = somme / nombre
+        variance = (carres - somme * moyenne) / (nombre - 1)
+    suffisant = nombre >= max(min_periods, 1)
+    moyenne = np.where(suffisant, moyenne + reference, np.nan)
+    ecart_type = np.where(suffisant & (nombre > 1), np.sqrt(np.maximum(variance, 0.0)), np.nan)
+    return moyenne, ecart_type
+
+
 class IndicateursBoursiers:
     @staticmethod
     def calculer_rsi(prix, periode=14):
-        """Calcule le RSI pour une série de prix"""
-        variations = prix.pct_change()
+        """Calcule le RSI de Wilder pour une série de prix.
+
+        Les moyennes des hausses et des baisses sont lissées par la moyenne
+        mobile exponentielle de Wilder (alpha = 1/période), calculée en une
+        seule passe récursive.
+        """
+        variations = prix.diff()
         gains = variations.clip(lower=0)
         pertes = -variations.clip(upper=0)
-        avg_gain = gains.rolling(window=periode, min_periods=1).mean()
-        avg_perte = pertes.rolling(window=periode, min_periods=1).mean()
+        alpha = 1.0 / periode
+        avg_gain = gains.ewm(alpha=alpha, adjust=False, min_periods=1).mean()
+        avg_perte = pertes.ewm(alpha=alpha, adjust=False, min_periods=1).mean()
         rs = avg_gain / avg_perte
         return 100.0 - (100.0 / (1.0 + rs))
 
@@ -135,28 +468,37 @@ class IndicateursBoursiers:
 
     @staticmethod
     def calculer_moyennes_mobiles(prix, periodes=(20, 50, 200)):
-        """Calcule les moyennes mobiles pour les périodes spécifiées"""
-        return {p: prix.rolling(window=p, min_periods=1).mean() for p in periodes}
+        """Calcule les moyennes mobiles pour les périodes spécifiées.
+
+        Une seule série de sommes cumulées sert à toutes les périodes.
+        """
+        cumuls = _cumuls(prix)
+        return {
+            p: pd.Series(_moyenne_glissante(cumuls, p, 1), index=prix.index)
+            for p in periodes
+        }
 
     @staticmethod
     def calculer_bollinger_bands(prix, periode=20, ecart_type=2):
-        """Calcule les bandes de Bollinger pour une série de prix"""
-        moyenne_mobile = prix.rolling(window=periode).mean()
-        std = prix.rolling(window=periode).std()
+        """Calcule les bandes de Bollinger pour une série de prix.
+
+        Moyenne et écart-type glissants sont obtenus ensemble à partir des
+        mêmes sommes cumulées, en une seule passe sur les prix.
+        """
+        moyenne, ecart = _moyenne_ecart_type_glissants(_cumuls(prix), periode, periode)
+        moyenne_mobile = pd.Series(moyenne, index=prix.index)
+        std = pd.Series(ecart, index=prix.index)
         bande_sup = moyenne_mobile + (std * ecart_type)
         bande_inf = moyenne_mobile - (std * ecart_type)
         return moyenne_mobile, bande_sup, bande_inf
 
     @staticmethod
-    def calculer_ratio_peg(ticker):
+    def calculer_ratio_peg(ticker, info=None):
         """Calcule le ratio PEG (Price/Earnings to Growth) pour un ticker avec gestion améliorée des erreurs"""
         try:
-            proxy = set_random_proxy()
-            if proxy:
-                logger.info(f"Proxy utilisé pour {ticker}: {proxy}")
-            stock = yf.Ticker(ticker, session=SESSION)
             # Récupérer les données financières
-            info = stock.info
+            if info is None:
+                info = get_info(ticker)
 
             # Vérifier si les données nécessaires sont disponibles
             if 'forwardPE' not in info:
@@ -198,14 +540,11 @@ class IndicateursBoursiers:
             return None
 
     @staticmethod
-    def calculer_price_to_book(ticker):
+    def calculer_price_to_book(ticker, info=None):
         """Récupère le ratio Price to Book pour un ticker"""
         try:
-            proxy = set_random_proxy()
-            if proxy:
-                logger.info(f"Proxy utilisé pour {ticker}: {proxy}")
-            stock = yf.Ticker(ticker, session=SESSION)
-            info = stock.info
+            if info is None:
+                info = get_info(ticker)
 
             pb = info.get('priceToBook')
             if pb is None:
@@ -216,14 +555,11 @@ class IndicateursBoursiers:
             return None
 
     @staticmethod
-    def calculer_ro_e(ticker):
+    def calculer_ro_e(ticker, info=None):
         """Récupère le Return on Equity (en pourcentage) pour un ticker"""
         try:
-            proxy = set_random_proxy()
-            if proxy:
-                logger.info(f"Proxy utilisé pour {ticker}: {proxy}")
-            stock = yf.Ticker(ticker, session=SESSION)
-            info = stock.info
+            if info is None:
+                info = get_info(ticker)
 
             roe = info.get('returnOnEquity')
             if roe is None:
@@ -235,48 +571,60 @@ class IndicateursBoursiers:
             return None
 
 class AnalyseAction:
-    def __init__(self, ticker):
+    def __init__(self, ticker, historique=None):
         self.ticker = ticker
+        self.historique = historique
+        self.info = None
         self.indicateurs = IndicateursBoursiers()
 
     def _telecharger_donnees(self):
         """Télécharge les données historiques de l'action"""
         try:
+            # Historique fourni à la construction ou déjà chargé en lot
+            if self.historique is not None:
+                return self.historique
+            if (self.ticker, '1y') in HIST_CACHE:
+                return HIST_CACHE[self.ticker, '1y']
+
             # Vérifier si des données récentes sont disponibles en cache
             historique = load_cached_data(self.ticker, '1y')
             if historique is not None:
                 return historique
 
-            proxy = set_random_proxy()
+            _, proxy = set_random_proxy()
             if proxy:
                 logger.info(f"Proxy utilisé pour {self.ticker}: {proxy}")
 
-            action = yf.Ticker(self.ticker, session=SESSION)
-            historique = action.history(period='1y')
+            action = get_ticker(self.ticker, proxy)
+            historique = _appel_yahoo(action.history, period='1y')
             if historique.empty:
                 logger.warning(f"Aucune donnée récupérée pour {self.ticker}")
             else:
                 logger.info(f"{len(historique)} lignes téléchargées pour {self.ticker}")
                 save_to_cache(self.ticker, '1y', historique)
 
-            return historique
+            return downcast_ohlcv(historique)
         except Exception as e:
             logger.error(f"Erreur lors du téléchargement des données pour {self.ticker}: {e}", exc_info=True)
             return None
 
-    def calculer_prix_achat_cible(self, historique, mm):
-        """Calcule le prix d'achat cible en fonction des moyennes mobiles"""
+    def calculer_prix_achat_cible(self, clotures, mm20, mm50):
+        """Calcule le prix d'achat cible en fonction des moyennes mobiles.
+
+        ``clotures`` est le tableau NumPy des clôtures ; ``mm20`` et ``mm50``
+        sont les dernières valeurs des moyennes mobiles correspondantes.
+        """
         try:
-            dernier_prix = historique['Close'].iloc[-1]
-            mm20 = mm[20].iloc[-1]
-            mm50 = mm[50].iloc[-1]
+            dernier_prix = clotures[-1]
 
             if np.isnan(mm20) or np.isnan(mm50):
                 logger.warning(f"Moyennes mobiles NaN pour {self.ticker}")
                 return None
 
             zone_neutre = (mm20 + mm50) / 2
-            volatilite = historique['Close'].tail(20).std()
+            recents = clotures[-20:]
+            recents = recents[~np.isnan(recents)]
+            volatilite = recents.std(ddof=1) if recents.size > 1 else np.nan
 
             seuil_haut = mm20 * (1 + MM_NEUTRAL_RATIO)
             seuil_bas = mm20 * (1 - MM_NEUTRAL_RATIO)
@@ -298,19 +646,25 @@ class AnalyseAction:
             logger.error(f"Erreur dans le calcul du prix d'achat cible pour {self.ticker}: {e}")
             return None
 
-    def calculer_prix_vente_cible(self, historique):
-        """Calcule le prix cible de vente basé sur les tendances avec validation"""
+    def calculer_prix_vente_cible(self, historique, volatilite=None):
+        """Calcule le prix cible de vente basé sur les tendances avec validation.
+
+        ``volatilite`` peut être fournie si elle a déjà été calculée par
+        ``_volatilite`` ; elle est sinon déduite des 30 dernières clôtures.
+        """
         try:
-            dernier_prix = historique['Close'].iloc[-1]
+            # Moyennes calculées en float64 même si l'historique est stocké en float32
+            clotures = historique['Close'].astype(np.float64)
+            dernier_prix = clotures.iloc[-1]
 
             # Vérification des données suffisantes pour les moyennes mobiles
             if len(historique) < 252:  # Un an de trading
                 logger.warning(f"Données insuffisantes pour {self.ticker}")
                 return None
 
-            tendance_3m = historique['Close'].tail(90).mean()
-            tendance_6m = historique['Close'].tail(180).mean()
-            tendance_12m = historique['Close'].tail(252).mean()
+            tendance_3m = clotures.tail(90).mean()
+            tendance_6m = clotures.tail(180).mean()
+            tendance_12m = clotures.tail(252).mean()
 
             # Vérification des NaN dans les tendances
             if np.isnan(tendance_3m) or np.isnan(tendance_6m) or np.isnan(tendance_12m):
@@ -320,7 +674,8 @@ class AnalyseAction:
             prix_cible = (tendance_3m * 0.5 + tendance_6m * 0.3 + tendance_12m * 0.2)
 
             # Calcul de la volatilité sur les 30 derniers jours pour plus de stabilité
-            volatilite = historique['Close'].tail(30).pct_change().std()
+            if volatilite is None:
+                volatilite = _volatilite(clotures.to_numpy())
             if np.isnan(volatilite):
                 logger.warning(f"Volatilité NaN pour {self.ticker}")
                 return None
@@ -356,9 +711,6 @@ class AnalyseAction:
 
     def analyser(self):
         """Analyse complète d'une action avec indicateurs supplémentaires"""
-        # Liste des tickers pour lesquels on ne calcule pas le ratio PEG
-        TICKERS_SANS_PEG = ["FDJ.PA", "NOKIA.HE", "ABI.BR"]
-
         try:
             # Récupération des données historiques
             historique = self._telecharger_donnees()
@@ -367,7 +719,8 @@ class AnalyseAction:
                 return None
 
             prix_cloture = historique['Close']
-            dernier_prix = prix_cloture.iloc[-1]
+            clotures = prix_cloture.to_numpy(dtype=np.float64)
+            dernier_prix = clotures[-1]
 
             # Calcul des indicateurs techniques de base
             rsi_vals = [
@@ -381,24 +734,41 @@ class AnalyseAction:
             # Calcul des bandes de Bollinger
             mm_bollinger, bande_sup, bande_inf = self.indicateurs.calculer_bollinger_bands(prix_cloture)
 
-            # Calcul du ratio PEG (en évitant certains tickers problématiques)
-            if self.ticker in TICKERS_SANS_PEG:
-                ratio_peg = None
-                logger.info(f"Calcul du PEG ignoré pour {self.ticker} (dans liste d'exclusion)")
-            else:
-                try:
-                    ratio_peg = self.indicateurs.calculer_ratio_peg(self.ticker)
-                except Exception as e:
-                    logger.warning(f"Erreur lors du calcul du ratio PEG pour {self.ticker}: {e}")
-                    ratio_peg = None
+            # Les signaux ne lisent que les dernières valeurs : conversion
+            # unique des séries en tableaux NumPy
+            mm20 = mm[20].to_numpy()
+            mm50_dernier = mm[50].iat[-1]
+            mm200_dernier = mm[200].iat[-1]
+            bande_inf = bande_inf.to_numpy()
+            bande_sup = bande_sup.to_numpy()
 
-            # Récupération d'indicateurs fondamentaux complémentaires
-            price_to_book = self.indicateurs.calculer_price_to_book(self.ticker)
-            roe = self.indicateurs.calculer_ro_e(self.ticker)
+            # Signaux techniques, calculés sans aucune requête réseau
+            try:
+                techniques = self._analyser_signaux_techniques(
+                    (macd - signal).to_numpy(), mm20, mm50_dernier, mm200_dernier,
+                    rsi_vals, clotures, bande_inf,
+                    historique['Open'].to_numpy(dtype=np.float64),
+                    historique['High'].to_numpy(dtype=np.float64),
+                    historique['Volume'].to_numpy(dtype=np.float64) if 'Volume' in historique else None,
+                )
+            except Exception as e:
+                logger.error(f"Erreur lors de l'analyse des signaux pour {self.ticker}: {e}")
+                techniques = {}
+
+            # Inutile de récupérer les données fondamentales si, même avec tous
+            # les signaux fondamentaux positifs, le score ne peut pas dépasser le seuil
+            poids_techniques = sum(
+                _POIDS_SIGNAUX[s] for s, v in techniques.items() if v and s in _POIDS_SIGNAUX
+            )
+            score_max = (poids_techniques + _POIDS_FONDAMENTAUX) / _TOTAL_POIDS if _TOTAL_POIDS else 0
+            if score_max <= MIN_OPPORTUNITY_SCORE:
+                logger.info(f"Score maximal atteignable trop faible pour {self.ticker}: {score_max}")
+                return None
 
             # Calcul des prix cibles
-            prix_achat_cible = self.calculer_prix_achat_cible(historique, mm)
-            prix_vente_cible = self.calculer_prix_vente_cible(historique)
+            prix_achat_cible = self.calculer_prix_achat_cible(clotures, mm20[-1], mm50_dernier)
+            volatilite = _volatilite(clotures)
+            prix_vente_cible = self.calculer_prix_vente_cible(historique, volatilite)
 
             # Vérification des prix cibles
             if prix_achat_cible is None or prix_vente_cible is None:
@@ -408,48 +778,40 @@ class AnalyseAction:
             # Calcul du gain potentiel
             gain_potentiel = ((prix_vente_cible - prix_achat_cible) / prix_achat_cible) * 100
 
-            # Analyse des signaux techniques avec gestion d'erreurs
+            # Données fondamentales récupérées en une seule requête
             try:
-                signaux = self._analyser_signaux(
-                    macd, signal, mm, rsi_vals, prix_cloture,
-                    bande_inf, bande_sup, ratio_peg,
-                    price_to_book, roe, historique
-                )
+                self.info = get_info(self.ticker)
             except Exception as e:
-                logger.error(f"Erreur lors de l'analyse des signaux pour {self.ticker}: {e}")
-                # Créer un dictionnaire de signaux par défaut en cas d'erreur
-                signaux = {
-                    'MACD': False, 'MM_20_50': False, 'MM_50_200': False,
-                    'RSI': False, 'Tendance': False, 'Bollinger': False,
-                    'PEG': False, 'PriceBook': False, 'ROE': False
-                }
-
-            # Vérification de la présence de tous les signaux attendus
-            expected_signals = {
-                'MACD', 'MM_20_50', 'MM_50_200', 'RSI',
-                'Tendance', 'Bollinger', 'PEG',
-                'PriceBook', 'ROE',
-                'Volume', 'Momentum', 'Breakout', 'BougiesVertes'
-            }
+                logger.error(f"Erreur lors de la récupération des données fondamentales pour {self.ticker}: {e}")
+                self.info = {}
 
-            # Ne conserver que les indicateurs dont la pondération est strictement positive
-            relevant_signals = {
-                s for s in expected_signals if SIGNAL_WEIGHTS.get(s, 1.0) > 0
-            }
+            # Calcul du ratio PEG (en évitant certains tickers problématiques)
+            if self.ticker in TICKERS_SANS_PEG:
+                ratio_peg = None
+                logger.info(f"Calcul du PEG ignoré pour {self.ticker} (dans liste d'exclusion)")
+            else:
+                try:
+                    ratio_peg = self.indicateurs.calculer_ratio_peg(self.ticker, self.info)
+                except Exception as e:
+                    logger.warning(f"Erreur lors du calcul du ratio PEG pour {self.ticker}: {e}")
+                    ratio_peg = None
 
-            for signal_name in relevant_signals:
-                if signal_name not in signaux:
-                    logger.warning(
-                        f"Signal manquant: {signal_name} pour {self.ticker}"
-                    )
-                    signaux[signal_name] = False
+            # Récupération d'indicateurs fondamentaux complémentaires
+            price_to_book = self.indicateurs.calculer_price_to_book(self.ticker, self.info)
+            roe = self.indicateurs.calculer_ro_e(self.ticker, self.info)
+
+            # Regroupement des signaux dans l'ordre d'affichage
+            signaux = dict.fromkeys(_ORDRE_SIGNAUX, False)
+            signaux.update(techniques)
+            signaux.update(
+                self._analyser_signaux_fondamentaux(ratio_peg, price_to_book, roe)
+            )
+            logger.info(f"Signaux pour {self.ticker}: {signaux}")
 
             # Calcul du score d'opportunité pondéré en ignorant les poids nuls
-            total_poids = sum(SIGNAL_WEIGHTS.get(s, 1.0) for s in relevant_signals)
+            total_poids = _TOTAL_POIDS
             poids_positifs = sum(
-                SIGNAL_WEIGHTS.get(s, 1.0)
-                for s, v in signaux.items()
-                if v and SIGNAL_WEIGHTS.get(s, 1.0) > 0
+                _POIDS_SIGNAUX[s] for s, v in signaux.items() if v and s in _POIDS_SIGNAUX
             )
             score_opportunite = poids_positifs / total_poids if total_poids else 0
 
@@ -491,14 +853,14 @@ class AnalyseAction:
                 # Calcul et ajout de la position dans les bandes de Bollinger
                 try:
                     resultat['bollinger_position'] = self._calculer_position_bollinger(
-                        dernier_prix, bande_inf.iloc[-1], bande_sup.iloc[-1]
+                        dernier_prix, bande_inf[-1], bande_sup[-1]
                     )
                 except Exception as e:
                     logger.warning(f"Erreur lors du calcul de la position Bollinger pour {self.ticker}: {e}")
                     resultat['bollinger_position'] = None
 
                 # Ajout d'informations supplémentaires utiles
-                resultat['volatilite'] = round(historique['Close'].tail(30).pct_change().std() * 100, 2)
+                resultat['volatilite'] = round(volatilite * 100, 2)
                 resultat['volume_moyen'] = int(historique['Volume'].tail(30).mean()) if 'Volume' in historique else None
 
             # Retour du résultat final
@@ -508,148 +870,137 @@ class AnalyseAction:
             logger.error(f"Erreur lors de l'analyse de {self.ticker}: {e}", exc_info=True)
             return None
 
-    def _analyser_signaux(
-        self, macd, signal, mm, rsi_list, prix_cloture,
-        bande_inf, bande_sup, ratio_peg, price_to_book, roe, historique
+    def _analyser_signaux_techniques(
+        self, macd_diff, mm20, mm50, mm200, rsi_list, clotures,
+        bande_inf, ouvertures, plus_hauts, volumes
     ):
-        """Analyse les signaux techniques avec les indicateurs supplémentaires"""
+        """Analyse les signaux techniques, calculés à partir de l'historique seul.
+
+        Les séries sont des tableaux NumPy alignés sur l'historique
+        (``macd_diff`` = MACD - signal, ``volumes`` vaut None en l'absence de
+        volumes) ; ``mm50`` et ``mm200`` sont les dernières valeurs des
+        moyennes mobiles correspondantes.
+        """
         try:
             # Signaux existants
             # Vérifier si nous avons suffisamment de données pour calculer la tendance
-            if len(mm[20]) < 5:
+            if len(mm20) < 5:
                 logger.warning(f"Pas assez de données de tendance pour {self.ticker}")
                 tendance = False
             else:
-                tendance = bool(mm[20].iloc[-1] > mm[20].iloc[-5])
+                tendance = bool(mm20[-1] > mm20[-5])
 
             # Vérifier tous les signaux et les convertir explicitement en booléens
-            diff = macd - signal
-            recent_cross = (
-                (diff.iloc[-3:] > 0) & (diff.shift(1).iloc[-3:] <= 0)
-            ).any()
+            # Croisement haussier du MACD sur l'une des trois dernières séances
+            diff_recents = macd_diff[-4:]
+            recent_cross = bool(np.any(
+                (diff_recents[1:] > 0) & (diff_recents[:-1] <= 0)
+            ))
             macd_signal = bool(recent_cross and tendance)
-            mm_20_50 = bool(mm[20].iloc[-1] > mm[50].iloc[-1])
-            mm_50_200 = bool(mm[50].iloc[-1] > mm[200].iloc[-1])
+            mm_20_50 = bool(mm20[-1] > mm50)
+            mm_50_200 = bool(mm50 > mm200)
             rsi_ok = all(RSI_LOWER < r < RSI_UPPER for r in rsi_list)
 
             # Nouveaux signaux
             # Signal Bollinger : prix proche de la bande inférieure (potentiel d'achat)
-            dernier_prix = prix_cloture.iloc[-1]
-            if np.isnan(bande_inf.iloc[-1]) or len(prix_cloture) < 3:
+            dernier_prix = clotures[-1]
+            if np.isnan(bande_inf[-1]) or len(clotures) < 3:
                 bollinger_signal = False
             else:
-                recent_touch = (
-                    prix_cloture.iloc[-3:-1]
-                    <= bande_inf.iloc[-3:-1] * (1 + BOLLINGER_THRESHOLD)
-                ).any()
+                recent_touch = bool(np.any(
+                    clotures[-3:-1] <= bande_inf[-3:-1] * (1 + BOLLINGER_THRESHOLD)
+                ))
                 rebond = (
-                    dernier_prix > prix_cloture.iloc[-2]
-                    and dernier_prix > bande_inf.iloc[-1]
+                    dernier_prix > clotures[-2]
+                    and dernier_prix > bande_inf[-1]
                 )
                 bollinger_signal = bool(rebond and recent_touch)
 
             # Signal Volume : volume du jour supérieur à la moyenne des 10 derniers jours
-            if 'Volume' in historique and len(historique['Volume']) >= 10:
-                volume_moy10 = historique['Volume'].tail(10).mean()
-                volume_signal = bool(historique['Volume'].iloc[-1] > volume_moy10)
+            if volumes is not None and len(volumes) >= 10:
+                derniers_volumes = volumes[-10:]
+                derniers_volumes = derniers_volumes[~np.isnan(derniers_volumes)]
+                volume_moy10 = derniers_volumes.mean() if derniers_volumes.size else np.nan
+                volume_signal = bool(volumes[-1] > volume_moy10)
             else:
                 volume_signal = False
 
             # Signal Momentum : accélération de la moyenne mobile 20 jours
-            if len(mm[20]) >= 10:
-                slope_recent = mm[20].iloc[-1] - mm[20].iloc[-5]
-                slope_past = mm[20].iloc[-5] - mm[20].iloc[-10]
+            if len(mm20) >= 10:
+                slope_recent = mm20[-1] - mm20[-5]
+                slope_past = mm20[-5] - mm20[-10]
                 momentum_signal = bool(slope_recent > slope_past and slope_recent > 0)
             else:
                 momentum_signal = False
 
             # Signal Breakout : clôture au-dessus du plus haut des 20 derniers jours (hors jour courant)
-            if len(historique['High']) >= 21:
-                resistance = historique['High'].shift(1).rolling(window=20).max().iloc[-1]
+            if len(plus_hauts) >= 21:
+                # Un NaN dans la fenêtre rend la résistance indéterminée, comme
+                # avec rolling(window=20).max()
+                resistance = plus_hauts[-21:-1].max()
                 breakout_signal = bool(dernier_prix > resistance)
             else:
                 breakout_signal = False
 
             # Signal Bougies vertes : 3 clôtures haussières sur les 4 derniers jours
-            if len(historique) >= 4:
-                dernieres = historique.tail(4)
-                verts = (dernieres['Close'] > dernieres['Open']).sum()
+            if len(clotures) >= 4:
+                verts = np.count_nonzero(clotures[-4:] > ouvertures[-4:])
                 bougies_signal = bool(verts >= 3)
             else:
                 bougies_signal = False
 
-            # Signal PEG : ratio PEG inférieur à 1 est généralement considéré comme bon
-            if ratio_peg is None:
-                peg_signal = False
-            else:
-                peg_signal = bool(0 < ratio_peg < PEG_MAX)
-
-            # Signal Price to Book : valeur inférieure à 1.5 considérée comme intéressante
-            if price_to_book is None:
-                pb_signal = False
-            else:
-                pb_signal = bool(price_to_book < 1.5)
-
-            # Signal ROE : supérieur à 10 %
-            if roe is None:
-                roe_signal = False
-            else:
-                roe_signal = bool(roe > 10)
-
             # Créer le dictionnaire de signaux avec des booléens explicites
-            signaux = {
+            return {
                 'MACD': macd_signal,
                 'MM_20_50': mm_20_50,
                 'MM_50_200': mm_50_200,
                 'RSI': rsi_ok,
                 'Tendance': tendance,
                 'Bollinger': bollinger_signal,
-                'PEG': peg_signal,
-                'PriceBook': pb_signal,
-                'ROE': roe_signal,
                 'Volume': volume_signal,
                 'Momentum': momentum_signal,
                 'Breakout': breakout_signal,
                 'BougiesVertes': bougies_signal,
             }
-
-            # Journaliser les signaux pour debug
-            logger.info(f"Signaux pour {self.ticker}: {signaux}")
-
-            return signaux
         except Exception as e:
             logger.error(f"Erreur lors de l'analyse des signaux pour {self.ticker}: {e}")
-            # En cas d'erreur, retourner tous les signaux à False
-            return {
-                'MACD': False,
-                'MM_20_50': False,
-                'MM_50_200': False,
-                'RSI': False,
-                'Tendance': False,
-                'Bollinger': False,
-                'PEG': False,
-                'PriceBook': False,
-                'ROE': False,
-                'Volume': False,
-                'Momentum': False,
-                'Breakout': False,
-                'BougiesVertes': False
-            }
+            # En cas d'erreur, tous les signaux techniques restent à False
+            return {}
+
+    def _analyser_signaux_fondamentaux(self, ratio_peg, price_to_book, roe):
+        """Analyse les signaux issus des données fondamentales"""
+        # Signal PEG : ratio PEG inférieur à 1 est généralement considéré comme bon
+        if ratio_peg is None:
+            peg_signal = False
+        else:
+            peg_signal = bool(0 < ratio_peg < PEG_MAX)
+
+        # Signal Price to Book : valeur inférieure à 1.5 considérée comme intéressante
+        if price_to_book is None:
+            pb_signal = False
+        else:
+            pb_signal = bool(price_to_book < 1.5)
+
+        # Signal ROE : supérieur à 10 %
+        if roe is None:
+            roe_signal = False
+        else:
+            roe_signal = bool(roe > 10)
+
+        return {
+            'PEG': peg_signal,
+            'PriceBook': pb_signal,
+            'ROE': roe_signal,
+        }
+
     @staticmethod
-    def obtenir_nom_entreprise(ticker):
+    def obtenir_nom_entreprise(ticker, info=None):
         """Récupère le nom complet de l'entreprise à partir du ticker"""
         try:
-            proxy = set_random_proxy()
-            if proxy:
-                logger.info(f"Proxy utilisé pour {ticker}: {proxy}")
-            action = yf.Ticker(ticker, session=SESSION)
-            info = action.info
-            if 'longName' in info:
-                return info['longName']
-            elif 'shortName' in info:
-                return info['shortName']
-            else:
-                return ticker  # Retourne le ticker si le nom n'est pas disponible
+            if info is None:
+                info = get_info(ticker)
+            # Retourne le ticker si le nom n'est pas disponible
+            return info.get('longName') or info.get('shortName') or ticker
         except Exception as e:
             logger.error(f"Erreur lors de la récupération du nom pour {ticker}: {e}")
             return ticker  # Retourne le ticker en cas d'erreur
@@ -657,36 +1008,34 @@ class AnalyseAction:
     @staticmethod
     def generer_lien_cotation(ticker):
         """Génère un lien vers la page Yahoo Finance pour le ticker"""
-        # Encodage du ticker pour l'URL si nécessaire
-        import urllib.parse
-        ticker_encode = urllib.parse.quote(ticker)
-        return f"https://finance.yahoo.com/quote/{ticker_encode}"
+        lien = TICKER_URLS.get(ticker)
+        if lien is None:
+            # Encodage du ticker pour l'URL si nécessaire
+            lien = f"https://finance.yahoo.com/quote/{urllib.parse.quote(ticker)}"
+        return lien
 
     def _formater_resultat(self, prix_actuel, prix_achat_cible, prix_vente_cible,
                           stop_loss, gain_potentiel, score_opportunite, rsi, signaux):
         """Formate le résultat de l'analyse avec validation des données"""
 
-        # Vérification des valeurs numériques
-        if (not isinstance(prix_actuel, (int, float)) or
-            not isinstance(prix_achat_cible, (int, float)) or
-            not isinstance(prix_vente_cible, (int, float)) or
-            not isinstance(stop_loss, (int, float)) or
-            not isinstance(gain_potentiel, (int, float)) or
-            not isinstance(score_opportunite, (int, float)) or
-            not isinstance(rsi, (int, float))):
+        # Vérification des valeurs numériques en une seule conversion NumPy
+        try:
+            valeurs = np.array(
+                [prix_actuel, prix_achat_cible, prix_vente_cible, stop_loss,
+                 gain_potentiel, score_opportunite, rsi],
+                dtype=np.float64,
+            )
+        except (TypeError, ValueError):
             logger.warning(f"Valeurs non numériques détectées pour {self.ticker}")
             return None
 
-        # Vérification des NaN
-        if (np.isnan(prix_actuel) or np.isnan(prix_achat_cible) or
-            np.isnan(prix_vente_cible) or np.isnan(stop_loss) or
-            np.isnan(gain_potentiel) or np.isnan(score_opportunite) or
-            np.isnan(rsi)):
+        # Vérification des NaN (et des valeurs infinies)
+        if not np.isfinite(valeurs).all():
             logger.warning(f"Valeurs NaN détectées pour {self.ticker}")
             return None
 
-        # Vérification des valeurs négatives ou nulles
-        if prix_actuel <= 0 or prix_achat_cible <= 0 or prix_vente_cible <= 0 or stop_loss <= 0:
+        # Vérification des valeurs négatives ou nulles (les quatre prix)
+        if (valeurs[:4] <= 0).any():
             logger.warning(f"Prix négatifs ou nuls détectés pour {self.ticker}")
             return None
 
@@ -711,9 +1060,12 @@ class AnalyseAction:
             return None
 
         # Obtenir le nom et le lien
-        nom_entreprise = AnalyseAction.obtenir_nom_entreprise(self.ticker)
+        nom_entreprise = AnalyseAction.obtenir_nom_entreprise(self.ticker, self.info)
         lien_cotation = AnalyseAction.generer_lien_cotation(self.ticker)
 
+        # Signaux positifs pris en compte dans le score, dans l'ordre d'affichage
+        positifs = [k for k, v in signaux.items() if v and k in _POIDS_SIGNAUX]
+
         # Si toutes les vérifications sont passées, renvoyer le résultat
         return {
             'ticker': self.ticker,
@@ -726,17 +1078,11 @@ class AnalyseAction:
             'gain_potentiel': round(gain_potentiel, 2),
             'score_opportunite': round(score_opportunite, 3),
             'rsi': round(rsi, 1),
-            'signaux': ', '.join(
-                [
-                    k
-                    for k, v in signaux.items()
-                    if v and SIGNAL_WEIGHTS.get(k, 1.0) > 0
-                ]
-            ),
+            'signaux': ', '.join(positifs),
+            # Mêmes signaux en ensemble, pour les filtrer sans relire la chaîne
+            'signaux_set': frozenset(positifs),
             'indicateurs': {
-                k: bool(v)
-                for k, v in signaux.items()
-                if SIGNAL_WEIGHTS.get(k, 1.0) > 0
+                k: bool(v) for k, v in signaux.items() if k in _POIDS_SIGNAUX
             },
         }
 
@@ -756,68 +1102,13 @@ class AnalyseAction:
 def analyse_sbf_120():
     """Analyse de toutes les actions du SBF 120 en parallèle avec validation des résultats"""
 
-    tickers_europe = [
-        # SBF 120 (France) - votre liste actuelle
-        "AC.PA", "ADP.PA", "AF.PA", "AI.PA", "AIR.PA", "ALO.PA", "ATE.PA", "AMUN.PA",
-        "APAM.AS", "MT.AS", "ARG.PA", "AKE.PA", "ATO.PA", "CS.PA", "0RSP.L", "BEN.PA",
-        "BB.PA", "BIM.PA", "BNP.PA", "BOL.PA", "EN.PA", "BVI.PA", "CAP.PA", "CARM.PA",
-        "CA.PA", "CLARI.PA", "COFA.PA", "COV.PA", "ACA.PA", "BN.PA", "AM.PA", "DSY.PA",
-        "DBG.PA", "EDEN.PA", "FGR.PA", "ELIOR.PA", "ELIS.PA", "EMEIS.PA", "ENGI.PA",
-        "ERA.PA", "EL.PA", "ES.PA", "RF.PA", "ERF.PA", "ENX.PA", "FDJ.PA", "FRVIA.PA",
-        "GFC.PA", "GET.PA", "GTT.PA", "RMS.PA", "ICAD.PA", "IDL.PA", "NK.PA", "ITP.PA",
-        "IPN.PA", "IPS.PA", "DEC.PA", "KER.PA", "LI.PA", "OR.PA", "LR.PA", "MC.PA",
-        "MAU.PA", "MEDCL.PA", "MERY.PA", "MRN.PA", "MMT.PA", "ML.PA", "NEOEN.PA",
-        "NEX.PA", "NXI.PA", "OPM.PA", "ORA.PA", "RI.PA", "PLNW.PA", "PLX.PA", "PUB.PA",
-        "RCO.PA", "RNO.PA", "RXL.PA", "RBT.PA", "RUI.PA", "SK.PA", "SAF.PA", "SGO.PA",
-        "SAN.PA", "DIM.PA", "SU.PA", "SCR.PA", "SESG.PA", "GLE.PA", "SW.PA", "SOI.PA",
-        "SOLB.BR", "SOP.PA", "SPIE.PA", "STLAP.PA", "STMPA.PA", "TE.PA", "TEP.PA", "TFI.PA",
-        "HO.PA", "TTE.PA", "TRI.PA", "UBI.PA", "URW.PA", "FR.PA", "VK.PA", "VLA.PA",
-        "VIE.PA", "VRLA.PA", "VCT.PA", "DG.PA", "VIRP.PA", "VIRI.PA", "VIV.PA", "VU.PA",
-        "MF.PA", "WLN.PA",
-
-        # Allemagne (DAX)
-        "ADS.DE", "ALV.DE", "BAYN.DE", "BMW.DE", "MBG.DE", "DBK.DE", "DTE.DE",
-        "EOAN.DE", "SAP.DE", "SIE.DE", "VOW3.DE", "DHL.DE", "HEN3.DE", "IFX.DE", "MRK.DE",
-
-        # Pays-Bas (AEX)
-        "ASML.AS", "INGA.AS", "PHIA.AS", "WKL.AS", "ADYEN.AS", "HEIA.AS", "KPN.AS",
-        "DSMN.AS", "ABN.AS", "AKZA.AS",
-
-        # Espagne (IBEX)
-        "SAN.MC", "TEF.MC", "IBE.MC", "BBVA.MC", "ITX.MC", "ELE.MC", "AMS.MC",
-        "CABK.MC", "REP.MC", "ACS.MC",
-
-        # Italie (FTSE MIB)
-        "ISP.MI", "ENI.MI", "ENEL.MI", "STLAM.MI", "UCG.MI", "TIT.MI", "PRY.MI",
-        "G.MI", "BAMI.MI", "MB.MI",
-
-        # Suisse (SMI)
-        "NESN.SW", "ROG.SW", "NOVN.SW", "UHR.SW", "ZURN.SW", "SIKA.SW", "LONN.SW",
-        "CFR.SW", "GEBN.SW", "SREN.SW",
-
-        # Royaume-Uni (FTSE 100)
-        "GSK.L", "AZN.L", "BP.L", "ULVR.L", "HSBA.L", "RIO.L", "LSEG.L",
-        "REL.L", "SHEL.L", "BHP.L",
-
-        # Suède (OMX Stockholm)
-        "ERIC-B.ST", "VOLV-B.ST", "SEB-A.ST", "ATCO-A.ST", "SHB-A.ST", "SCA-B.ST",
-        "ESSITY-B.ST", "SAND.ST", "ABB.ST", "INVE-B.ST",
-
-        # Finlande (OMX Helsinki)
-        "NOKIA.HE", "STERV.HE", "SAMPO.HE", "UPM.HE", "FORTUM.HE", "ORNBV.HE",
-        "KESKOB.HE", "NESTE.HE", "KNEBV.HE", "ELISA.HE",
-
-        # Belgique (BEL 20)
-        "ABI.BR", "KBC.BR", "COLR.BR", "UCB.BR", "GLPG.BR",
-
-        # Danemark (OMX Copenhagen)
-        "NOVO-B.CO", "DSV.CO", "MAERSK-B.CO", "CARL-B.CO", "COLO-B.CO"
-    ]
+    # Chargement groupé des historiques avant l'analyse en parallèle
+    historiques = telecharger_historiques(TICKERS_EUROPE)
 
     resultats = []
     with concurrent.futures.ThreadPoolExecutor(max_workers=20) as executor:
-        futures = {executor.submit(AnalyseAction(ticker).analyser): ticker
-                  for ticker in tickers_europe}
+        futures = {executor.submit(AnalyseAction(ticker, historiques.get(ticker)).analyser): ticker
+                  for ticker in TICKERS_EUROPE}
 
         for future in concurrent.futures.as_completed(futures):
             try:
@@ -1,50 +1,28 @@
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
-from typing import Dict, List
+from typing import Dict, List, Optional, Tuple
 
 from rich.console import Console
 from rich.table import Table
-from rich.progress import track
+from rich.progress import Progress, track
 import yaml
 import os
-
-import yfinance as yf
-
-from analyzer import AnalyseAction, SIGNAL_WEIGHTS
-from cache_utils import load_cached_data, save_to_cache
-
-# Liste des tickers à analyser (repris de analyzer.py)
-TICKERS = [
-    "AC.PA", "ADP.PA", "AF.PA", "AI.PA", "AIR.PA", "ALO.PA", "ATE.PA", "AMUN.PA",
-    "APAM.AS", "MT.AS", "ARG.PA", "AKE.PA", "ATO.PA", "CS.PA", "0RSP.L", "BEN.PA",
-    "BB.PA", "BIM.PA", "BNP.PA", "BOL.PA", "EN.PA", "BVI.PA", "CAP.PA", "CARM.PA",
-    "CA.PA", "CLARI.PA", "COFA.PA", "COV.PA", "ACA.PA", "BN.PA", "AM.PA", "DSY.PA",
-    "DBG.PA", "EDEN.PA", "FGR.PA", "ELIOR.PA", "ELIS.PA", "EMEIS.PA", "ENGI.PA",
-    "ERA.PA", "EL.PA", "ES.PA", "RF.PA", "ERF.PA", "ENX.PA", "FDJ.PA", "FRVIA.PA",
-    "GFC.PA", "GET.PA", "GTT.PA", "RMS.PA", "ICAD.PA", "IDL.PA", "NK.PA", "ITP.PA",
-    "IPN.PA", "IPS.PA", "DEC.PA", "KER.PA", "LI.PA", "OR.PA", "LR.PA", "MC.PA",
-    "MAU.PA", "MEDCL.PA", "MERY.PA", "MRN.PA", "MMT.PA", "ML.PA", "NEOEN.PA",
-    "NEX.PA", "NXI.PA", "OPM.PA", "ORA.PA", "RI.PA", "PLNW.PA", "PLX.PA", "PUB.PA",
-    "RCO.PA", "RNO.PA", "RXL.PA", "RBT.PA", "RUI.PA", "SK.PA", "SAF.PA", "SGO.PA",
-    "SAN.PA", "DIM.PA", "SU.PA", "SCR.PA", "SESG.PA", "GLE.PA", "SW.PA", "SOI.PA",
-    "SOLB.BR", "SOP.PA", "SPIE.PA", "STLAP.PA", "STMPA.PA", "TE.PA", "TEP.PA", "TFI.PA",
-    "HO.PA", "TTE.PA", "TRI.PA", "UBI.PA", "URW.PA", "FR.PA", "VK.PA", "VLA.PA",
-    "VIE.PA", "VRLA.PA", "VCT.PA", "DG.PA", "VIRP.PA", "VIRI.PA", "VIV.PA", "VU.PA",
-    "MF.PA", "WLN.PA", "ADS.DE", "ALV.DE", "BAYN.DE", "BMW.DE", "MBG.DE", "DBK.DE",
-    "DTE.DE", "EOAN.DE", "SAP.DE", "SIE.DE", "VOW3.DE", "DHL.DE", "HEN3.DE", "IFX.DE",
-    "MRK.DE", "ASML.AS", "INGA.AS", "PHIA.AS", "WKL.AS", "ADYEN.AS", "HEIA.AS", "KPN.AS",
-    "DSMN.AS", "ABN.AS", "AKZA.AS", "SAN.MC", "TEF.MC", "IBE.MC", "BBVA.MC", "ITX.MC",
-    "ELE.MC", "AMS.MC", "CABK.MC", "REP.MC", "ACS.MC", "ISP.MI", "ENI.MI", "ENEL.MI",
-    "STLAM.MI", "UCG.MI", "TIT.MI", "PRY.MI", "G.MI", "BAMI.MI", "MB.MI", "NESN.SW",
-    "ROG.SW", "NOVN.SW", "UHR.SW", "ZURN.SW", "SIKA.SW", "LONN.SW", "CFR.SW", "GEBN.SW",
-    "SREN.SW", "GSK.L", "AZN.L", "BP.L", "ULVR.L", "HSBA.L", "RIO.L", "LSEG.L", "REL.L",
-    "SHEL.L", "BHP.L", "ERIC-B.ST", "VOLV-B.ST", "SEB-A.ST", "ATCO-A.ST", "SHB-A.ST",
-    "SCA-B.ST", "ESSITY-B.ST", "SAND.ST", "ABB.ST", "INVE-B.ST", "NOKIA.HE", "STERV.HE",
-    "SAMPO.HE", "UPM.HE", "FORTUM.HE", "ORNBV.HE", "KESKOB.HE", "NESTE.HE", "KNEBV.HE",
-    "ELISA.HE", "ABI.BR", "KBC.BR", "COLR.BR", "UCB.BR", "GLPG.BR", "NOVO-B.CO",
-    "DSV.CO", "MAERSK-B.CO", "CARL-B.CO", "COLO-B.CO"
-]
+import pickle
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from analyzer import (
+    AnalyseAction, INFO_CACHE, SIGNAL_WEIGHTS, YF_MAX_REQUETES, get_info,
+    get_ticker, reset_sessions, telecharger_historiques,
+)
+from cache_utils import (
+    CACHE_DIR, MAX_AGE, cache_age, downcast_ohlcv, load_cached_data, save_to_cache,
+)
+from tickers import TICKERS_EUROPE
+
+# Liste des tickers à analyser (la même que pour l'analyse quotidienne)
+TICKERS = TICKERS_EUROPE
 
 console = Console()
 
@@ -59,32 +37,135 @@ except Exception:
 PROFIT_TARGET_PERCENT = cfg.get("profit_target_percent", 10)
 
 # Signaux réellement pris en compte (poids > 0)
-ACTIVE_SIGNALS = {k for k, v in SIGNAL_WEIGHTS.items() if v > 0}
+ACTIVE_SIGNALS = frozenset(k for k, v in SIGNAL_WEIGHTS.items() if v > 0)
 
 CACHE_PERIOD = "5y"
 DATA_CACHE: Dict[str, pd.DataFrame] = {}
+# Par ticker : tableaux des clôtures et du plus bas des 20 dernières clôtures
+CLOSE_ARRAYS: Dict[str, np.ndarray] = {}
+SUPPORT_ARRAYS: Dict[str, np.ndarray] = {}
+
+# Historiques de tous les tickers regroupés dans un seul fichier : relu d'un
+# bloc au lancement suivant plutôt que fichier par fichier
+BUNDLE_FILE = os.path.join(CACHE_DIR, f"backtest_{CACHE_PERIOD}.pkl")
+
+# Nombre de séances transmises à l'analyse pour chaque jour simulé
+ANALYSIS_WINDOW = 252
+
+# Processus utilisés pour analyser en parallèle les tickers d'une même journée
+MAX_WORKERS = os.cpu_count() or 1
+# fork là où il existe : les processus héritent de DATA_CACHE et INFO_CACHE.
+# Sinon (spawn, forkserver), ils rechargent les historiques depuis le disque
+MP_CONTEXT = (multiprocessing.get_context("fork")
+              if "fork" in multiprocessing.get_all_start_methods() else None)
+
+# Vrai dans les processus du pool : get_data n'y fait aucune requête Yahoo,
+# elles échapperaient au sémaphore YF_SEM du processus principal
+_WORKER = False
+
+# Nombre de jours simulés entre deux rafraîchissements de la barre de progression
+PROGRESS_STEP = 10
+
+
+def _index_naif(df: pd.DataFrame) -> pd.DataFrame:
+    """Retire le fuseau horaire de l'index (Ticker.history renvoie un index
+    localisé, yf.download un index naïf) pour le comparer aux dates simulées."""
+    if isinstance(df.index, pd.DatetimeIndex) and df.index.tz is not None:
+        df = df.tz_localize(None)
+    return df
+
+
+def _cache_data(ticker: str, df: pd.DataFrame) -> pd.DataFrame:
+    """Conserve l'historique d'un ticker (prix en float32) et ses clôtures en tableaux NumPy."""
+    df = downcast_ohlcv(_index_naif(df))
+    DATA_CACHE[ticker] = df
+    if df.empty:
+        CLOSE_ARRAYS[ticker] = SUPPORT_ARRAYS[ticker] = np.empty(0)
+        return df
+    close = df["Close"].astype(np.float64)
+    CLOSE_ARRAYS[ticker] = close.to_numpy()
+    # rolling().min() en C, calculé une seule fois pour tout l'historique
+    SUPPORT_ARRAYS[ticker] = close.rolling(window=20).min().to_numpy()
+    return df
+
+
+def _load_bundle(check_age: bool = True):
+    """Recharge dans DATA_CACHE les historiques de BUNDLE_FILE s'il est encore valable.
+
+    Le fichier est ignoré s'il a expiré ou si le cache disque d'un ticker a
+    été réécrit depuis sa création, sauf si ``check_age`` est faux.
+    """
+    try:
+        bundle_age = datetime.now() - datetime.fromtimestamp(os.stat(BUNDLE_FILE).st_mtime)
+    except OSError:
+        return
+    if check_age:
+        if bundle_age >= MAX_AGE:
+            return
+        for ticker in TICKERS:
+            age = cache_age(ticker, CACHE_PERIOD)
+            if age is not None and age < bundle_age:
+                return
+    try:
+        with open(BUNDLE_FILE, "rb") as f:
+            bundle = pickle.load(f)
+    except Exception as e:
+        console.log(f"Lecture de {BUNDLE_FILE} impossible: {e}")
+        return
+    # Sans contrôle d'âge (processus du pool), le fichier vient d'être écrit
+    # par le processus principal : tout son contenu est repris
+    for ticker in (TICKERS if check_age else bundle):
+        if ticker in bundle:
+            _cache_data(ticker, bundle[ticker])
+
+
+def _save_bundle():
+    """Écrit les historiques non vides de DATA_CACHE dans BUNDLE_FILE."""
+    tmp = BUNDLE_FILE + ".tmp"
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        with open(tmp, "wb") as f:
+            pickle.dump({t: df for t, df in DATA_CACHE.items() if not df.empty}, f,
+                        protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, BUNDLE_FILE)
+    except Exception as e:
+        console.log(f"Écriture de {BUNDLE_FILE} impossible: {e}")
 
 
 def build_dataset():
     """Télécharge et met en cache les données sur 5 ans pour tous les tickers."""
     console.print("[bold]Constitution du jeu de données (5 ans)[/bold]")
+    _load_bundle()
+    missing = [t for t in TICKERS if t not in DATA_CACHE]
+    if not missing:
+        console.log(f"{len(TICKERS)} historiques rechargés depuis {BUNDLE_FILE}")
+        return
+    # Les tickers absents du cache disque sont téléchargés par lots ; get_data
+    # ne sert plus que de repli ticker par ticker
+    for ticker, df in telecharger_historiques(missing, period=CACHE_PERIOD).items():
+        if not df.empty:
+            _cache_data(ticker, df)
     for i, ticker in enumerate(track(TICKERS, description="Collecte")):
         df = get_data(ticker)
         count = len(df) if df is not None else 0
         console.log(f"[{i + 1}/{len(TICKERS)}] {ticker}: {count} valeurs")
+    _save_bundle()
 
 
 def get_data(ticker: str) -> pd.DataFrame:
     if ticker in DATA_CACHE:
         return DATA_CACHE[ticker]
+    if _WORKER:
+        # Processus du pool : cache disque quel que soit son âge, jamais de requête
+        df = load_cached_data(ticker, CACHE_PERIOD, max_age=timedelta.max)
+        return _cache_data(ticker, df if df is not None else pd.DataFrame())
     df = load_cached_data(ticker, CACHE_PERIOD)
     if df is None:
-        yf_ticker = yf.Ticker(ticker)
-        df = yf_ticker.history(period=CACHE_PERIOD)
+        # Session HTTP partagée avec analyzer : connexion et cookie Yahoo réutilisés
+        df = get_ticker(ticker).history(period=CACHE_PERIOD)
         if not df.empty:
             save_to_cache(ticker, CACHE_PERIOD, df)
-    DATA_CACHE[ticker] = df
-    return df
+    return _cache_data(ticker, df)
 
 
 class BacktestAnalyseAction(AnalyseAction):
@@ -94,107 +175,211 @@ class BacktestAnalyseAction(AnalyseAction):
 
     def _telecharger_donnees(self):
         df = get_data(self.ticker)
-        df = df[df.index <= self.date]
-        df = df.tail(252)
-        return df
-
-
-def simulate(initial_cash: float = 10000.0):
+        # Index trié : recherche dichotomique plutôt qu'un masque booléen
+        end = df.index.searchsorted(self.date, side="right")
+        return df.iloc[max(0, end - ANALYSIS_WINDOW):end]
+
+
+def _aligned_matrices(days: pd.DatetimeIndex) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Aligne tous les tickers sur les jours simulés.
+
+    Retourne trois matrices (jours, tickers), colonnes dans l'ordre de
+    ``TICKERS`` : la position de la dernière cotation connue à chaque jour
+    (-1 avant la première, comme ``data[data.index <= jour]`` vide), la
+    clôture et le plus bas des 20 dernières clôtures correspondants.
+    """
+    positions = np.full((len(days), len(TICKERS)), -1, dtype=np.int64)
+    closes = np.full(positions.shape, np.nan)
+    supports = np.full(positions.shape, np.nan)
+    for col, ticker in enumerate(TICKERS):
+        df = get_data(ticker)
+        if df.empty:
+            continue
+        pos = df.index.normalize().searchsorted(days, side="right") - 1
+        known = pos >= 0
+        positions[known, col] = pos[known]
+        closes[known, col] = CLOSE_ARRAYS[ticker][pos[known]]
+        supports[known, col] = SUPPORT_ARRAYS[ticker][pos[known]]
+    return positions, closes, supports
+
+
+def _prefetch_infos():
+    """Récupère dans le processus principal les données fondamentales de
+    tous les tickers, avant de créer le pool.
+
+    Les processus du pool les retrouvent ensuite dans INFO_CACHE, hérité
+    (fork) ou transmis à leur initialisation, sans requête Yahoo : chacun
+    ayant son propre sémaphore, ils ne respecteraient pas la limite
+    YF_MAX_REQUETES.
+    """
+    def charger(ticker):
+        try:
+            get_info(ticker)
+        except Exception as e:
+            console.log(f"Données fondamentales indisponibles pour {ticker}: {e}")
+
+    tickers = [t for t in TICKERS if not get_data(t).empty]
+    with ThreadPoolExecutor(max_workers=YF_MAX_REQUETES) as executor:
+        list(executor.map(charger, tickers))
+
+
+def _init_worker(infos: Dict[str, dict]):
+    """Initialise un processus du pool : pas de session réseau héritée du parent.
+
+    Hors fork, DATA_CACHE est rempli depuis BUNDLE_FILE (écrit juste avant la
+    création du pool) et INFO_CACHE depuis ``infos``.
+    """
+    global _WORKER
+    _WORKER = True
+    reset_sessions()
+    INFO_CACHE.update(infos)
+    if not DATA_CACHE:
+        _load_bundle(check_age=False)
+
+
+def _analyse_one(args):
+    """Analyse un ticker à une date donnée ; exécutée dans un processus du pool."""
+    ticker, current_day = args
+    return ticker, BacktestAnalyseAction(ticker, current_day).analyser()
+
+
+def simulate(initial_cash: float = 10000.0, verbose: bool = False):
     start_date = datetime.now() - timedelta(days=365)
     end_date = datetime.now()
     days = pd.bdate_range(start_date, end_date)
+    console.print(
+        f"[b]Simulation du {start_date.date()} au {end_date.date()}[/b] "
+        f"({len(days)} jours, cash initial {initial_cash:.2f})"
+    )
 
     cash = initial_cash
     portfolio: Dict[str, Dict] = {}
     buy_count = 0
     sell_count = 0
-
-    for current_day in track(days, description="Simulation"):
-        operations: List[str] = []
-        # Vendre si l'objectif est atteint ou si un support proche est touche
-        for ticker in list(portfolio.keys()):
-            data = get_data(ticker)
-            history = data[data.index <= current_day]
-            if history.empty:
-                continue
-            price = history["Close"].iloc[-1]
-            target = portfolio[ticker]["target"]
-            support = history["Close"].rolling(window=20).min().iloc[-1]
-            if price >= target or support >= target * 0.98:
-                qty = portfolio[ticker]["quantity"]
+    positions, closes, supports = _aligned_matrices(days)
+    columns = {ticker: col for col, ticker in enumerate(TICKERS)}
+    # Quantité détenue et objectif de vente par colonne, tenus à jour avec portfolio
+    holdings = np.zeros(len(TICKERS), dtype=np.int64)
+    targets = np.zeros(len(TICKERS))
+    # Dernière analyse de chaque ticker : (position de la dernière cotation, résultat)
+    last_analysis: Dict[str, Tuple[int, Optional[dict]]] = {}
+
+    # Pool créé une seule fois : avec fork, les processus héritent de DATA_CACHE
+    # déjà rempli par build_dataset ; sinon ils relisent BUNDLE_FILE
+    # Barre de progression rafraîchie tous les PROGRESS_STEP jours seulement,
+    # sans le thread de rafraîchissement automatique
+    _prefetch_infos()
+    if MP_CONTEXT is None:
+        _save_bundle()
+    with ProcessPoolExecutor(max_workers=MAX_WORKERS, mp_context=MP_CONTEXT,
+                             initializer=_init_worker, initargs=({} if MP_CONTEXT else dict(INFO_CACHE),)) as pool, \
+            Progress(console=console, auto_refresh=False) as progress:
+        task = progress.add_task("Simulation", total=len(days))
+        for day_i, current_day in enumerate(days):
+            operations: List[str] = []
+            # Vendre si l'objectif est atteint ou si un support proche est touche ;
+            # les clôtures inconnues (NaN) ne déclenchent aucune vente
+            to_sell = np.nonzero(
+                (holdings > 0)
+                & ((closes[day_i] >= targets) | (supports[day_i] >= targets * 0.98))
+            )[0]
+            for col in to_sell:
+                ticker = TICKERS[col]
+                price = closes[day_i, col]
+                qty = int(holdings[col])
                 cash += qty * price
                 sell_count += qty
                 operations.append(f"Vente {qty} {ticker} @ {price:.2f}")
+                holdings[col] = 0
+                targets[col] = 0.0
                 del portfolio[ticker]
 
-        # Rechercher les meilleures opportunites d'achat
-        opportunities = []
-        for ticker in TICKERS:
-            if ticker in portfolio:
-                continue
-            action = BacktestAnalyseAction(ticker, current_day)
-            result = action.analyser()
-            if not result:
-                continue
-
-            # Filtrer les signaux pour ne conserver que ceux avec un poids positif
-            active_result_signals = [
-                s.strip() for s in result.get("signaux", "").split(",") if s.strip() in ACTIVE_SIGNALS
-            ]
-            if not active_result_signals:
-                continue
-
-            buy_price = result["prix_achat_cible"]
-            if buy_price and buy_price <= cash:
-                opportunities.append({
-                    "ticker": ticker,
-                    "buy": buy_price,
-                    "gain": result.get("gain_potentiel", 0)
-                })
-
-        opportunities.sort(key=lambda x: x["gain"], reverse=True)
-
-        for opp in opportunities:
-            if cash < opp["buy"]:
-                continue
-            qty = int(cash // opp["buy"])
-            if qty <= 0:
-                continue
-            target_price = opp["buy"] * (1 + PROFIT_TARGET_PERCENT / 100)
-            portfolio[opp["ticker"]] = {
-                "quantity": qty,
-                "buy": opp["buy"],
-                "target": target_price,
-                "date": current_day
-            }
-            cash -= qty * opp["buy"]
-            buy_count += qty
-            operations.append(f"Achat {qty} {opp['ticker']} @ {opp['buy']:.2f}")
-            if cash < min((o["buy"] for o in opportunities), default=cash + 1):
-                break
-
-        # Affichage du portefeuille et des operations
-        if operations:
-            for op in operations:
-                console.log(op)
-
-        # Affichage du portefeuille
-        table = Table(title=f"{current_day.date()} - Cash: {cash:.2f}")
-        table.add_column("Ticker")
-        table.add_column("Qty", justify="right")
-        table.add_column("Buy", justify="right")
-        table.add_column("Target", justify="right")
-        for t, info in portfolio.items():
-            table.add_row(t, str(info["quantity"]), f"{info['buy']:.2f}", f"{info['target']:.2f}")
-        console.print(table)
+            # Rechercher les meilleures opportunites d'achat
+            # Seuls les tickers ayant reçu une nouvelle cotation depuis leur
+            # dernière analyse sont réanalysés (jours fériés, données manquantes)
+            candidates = []
+            todo = []
+            for ticker in TICKERS:
+                if ticker in portfolio:
+                    continue
+                pos = positions[day_i, columns[ticker]]
+                if pos < 0:
+                    continue
+                candidates.append(ticker)
+                last = last_analysis.get(ticker)
+                if last is None or last[0] != pos:
+                    todo.append((ticker, pos))
+            results = pool.map(_analyse_one, [(t, current_day) for t, _ in todo], chunksize=8)
+            for (ticker, pos), (_, result) in zip(todo, results):
+                last_analysis[ticker] = (pos, result)
+
+            opportunities = []
+            for ticker in candidates:
+                result = last_analysis[ticker][1]
+                if not result:
+                    continue
+
+                # Ignorer les résultats sans aucun signal de poids positif
+                if result["signaux_set"].isdisjoint(ACTIVE_SIGNALS):
+                    continue
+
+                buy_price = result["prix_achat_cible"]
+                if buy_price and buy_price <= cash:
+                    opportunities.append({
+                        "ticker": ticker,
+                        "buy": buy_price,
+                        "gain": result.get("gain_potentiel", 0)
+                    })
+
+            opportunities.sort(key=lambda x: x["gain"], reverse=True)
+
+            for opp in opportunities:
+                if cash < opp["buy"]:
+                    continue
+                qty = int(cash // opp["buy"])
+                if qty <= 0:
+                    continue
+                target_price = opp["buy"] * (1 + PROFIT_TARGET_PERCENT / 100)
+                portfolio[opp["ticker"]] = {
+                    "quantity": qty,
+                    "buy": opp["buy"],
+                    "target": target_price,
+                    "date": current_day
+                }
+                col = columns[opp["ticker"]]
+                holdings[col] = qty
+                targets[col] = target_price
+                cash -= qty * opp["buy"]
+                buy_count += qty
+                operations.append(f"Achat {qty} {opp['ticker']} @ {opp['buy']:.2f}")
+                if cash < min((o["buy"] for o in opportunities), default=cash + 1):
+                    break
+
+            # Les operations sont toujours journalisees
+            if operations:
+                for op in operations:
+                    console.log(op)
+
+            # Affichage du portefeuille, coûteux à rendre : seulement en mode verbeux
+            if verbose:
+                table = Table(title=f"{current_day.date()} - Cash: {cash:.2f}")
+                table.add_column("Ticker")
+                table.add_column("Qty", justify="right")
+                table.add_column("Buy", justify="right")
+                table.add_column("Target", justify="right")
+                for t, info in portfolio.items():
+                    table.add_row(t, str(info["quantity"]), f"{info['buy']:.2f}", f"{info['target']:.2f}")
+                console.print(table)
+
+            if (day_i + 1) % PROGRESS_STEP == 0 or day_i + 1 == len(days):
+                progress.update(task, completed=day_i + 1, refresh=True)
 
     # Valorisation finale
     final_value = cash
     for ticker, info in portfolio.items():
-        data = get_data(ticker)
-        if not data.empty:
-            last_price = data[data.index <= end_date]["Close"].iloc[-1]
-            final_value += last_price * info["quantity"]
+        col = columns[ticker]
+        if positions[-1, col] >= 0:
+            final_value += closes[-1, col] * info["quantity"]
 
     performance = (final_value - initial_cash) / initial_cash * 100
 
@@ -209,6 +394,8 @@ if __name__ == "__main__":
     import argparse
     parser = argparse.ArgumentParser(description="Backtest simple")
     parser.add_argument("--cash", type=float, default=10000.0, help="Montant initial")
+    parser.add_argument("--verbose", action="store_true",
+                        help="Affiche le portefeuille à chaque jour simulé")
     args = parser.parse_args()
     build_dataset()
-    simulate(args.cash)
+    simulate(args.cash, verbose=args.verbose)
@@ -1,5 +1,10 @@
 import os
-from datetime import datetime, timedelta
+import json
+import time
+import functools
+import threading
+from datetime import timedelta
+import numpy as np
 import pandas as pd
 import logging
 
@@ -7,36 +12,173 @@ BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 
 CACHE_DIR = os.path.join(BASE_DIR, 'cache')
 MAX_AGE = timedelta(hours=24)
+os.makedirs(CACHE_DIR, exist_ok=True)
 
 logger = logging.getLogger(__name__)
 
+# Parquet stores native dtypes and the DatetimeIndex, and loads much faster
+# than CSV; it needs the optional pyarrow package, CSV is used otherwise.
+try:
+    import pyarrow  # noqa: F401
+    DATA_EXT = 'parquet'
+except ImportError:
+    DATA_EXT = 'csv'
 
-def _cache_path(ticker: str, period: str) -> str:
+
+# Price columns stored as float32: daily quotes have far fewer significant
+# digits than float32 keeps, and memory and cache size halve. Volume keeps
+# float64: float32 cannot represent every integer above 2**24, and large
+# daily volumes would be rounded for good once written to the cache.
+FLOAT32_COLUMNS = ('Open', 'High', 'Low', 'Close', 'Adj Close')
+
+
+def downcast_ohlcv(df: pd.DataFrame) -> pd.DataFrame:
+    """Return ``df`` with its price columns converted to float32."""
+    columns = [c for c in FLOAT32_COLUMNS if c in df.columns and df[c].dtype != np.float32]
+    if not columns:
+        return df
+    return df.astype({c: np.float32 for c in columns})
+
+
+@functools.lru_cache(maxsize=None)
+def _cache_path(ticker: str, period: str, ext: str = 'csv') -> str:
     ticker_safe = ticker.replace('/', '_').replace('\\', '_').replace('.', '_')
-    os.makedirs(CACHE_DIR, exist_ok=True)
-    return os.path.join(CACHE_DIR, f"{ticker_safe}_{period}.csv")
+    return os.path.join(CACHE_DIR, f"{ticker_safe}_{period}.{ext}")
+
+
+def _migrate_csv(legacy: str) -> None:
+    """Rewrite a legacy CSV cache file as Parquet, keeping its timestamp."""
+    path = os.path.splitext(legacy)[0] + '.parquet'
+    name = os.path.basename(legacy)
+    try:
+        if not os.path.exists(path):
+            df = pd.read_csv(legacy, index_col=0, parse_dates=True)
+            df.to_parquet(path, compression='snappy')
+            stat = os.stat(legacy)
+            # The migrated file must not look fresher than the data it holds
+            os.utime(path, (stat.st_atime, stat.st_mtime))
+        os.remove(legacy)
+        logger.info(f"Cache CSV converti en Parquet : {name}")
+    except Exception as e:
+        logger.warning(f"Impossible de convertir le cache CSV {name}: {e}")
+
+
+def _migrate_legacy_cache() -> None:
+    """Convert every legacy CSV price cache to Parquet, once at import, so
+    that lookups never have to check for a CSV file."""
+    try:
+        entries = [e.path for e in os.scandir(CACHE_DIR) if e.name.endswith('.csv')]
+    except OSError:
+        return
+    for legacy in entries:
+        _migrate_csv(legacy)
+
+
+if DATA_EXT != 'csv':
+    _migrate_legacy_cache()
+
+
+def _data_path(ticker: str, period: str) -> str:
+    """Path of the price cache file."""
+    return _cache_path(ticker, period, DATA_EXT)
+
+
+def _fresh_mtime(path: str, max_age: timedelta):
+    """Return the mtime of ``path`` if it is younger than ``max_age``, else None
+    (one stat call)."""
+    try:
+        mtime = os.stat(path).st_mtime
+    except OSError:
+        return None
+    return mtime if time.time() - mtime < max_age.total_seconds() else None
+
+
+# Frames already parsed in this process, by path: (mtime of the file, frame).
+# An entry is only reused while the file keeps the same mtime.
+_MEMORY_CACHE = {}
+_MEMORY_CACHE_LOCK = threading.Lock()
+
+
+def clear_memory_cache() -> None:
+    """Forget the frames parsed by load_cached_data in this process."""
+    with _MEMORY_CACHE_LOCK:
+        _MEMORY_CACHE.clear()
+
+
+def cache_age(ticker: str, period: str = '1y'):
+    """Return the age of the cache file, or None if it does not exist."""
+    path = _data_path(ticker, period)
+    try:
+        mtime = os.stat(path).st_mtime
+    except OSError:
+        return None
+    return timedelta(seconds=time.time() - mtime)
 
 
 def load_cached_data(ticker: str, period: str = '1y', max_age: timedelta = MAX_AGE):
     """Load cached data if it exists and is recent enough."""
-    path = _cache_path(ticker, period)
-    if os.path.exists(path):
-        mtime = datetime.fromtimestamp(os.path.getmtime(path))
-        if datetime.now() - mtime < max_age:
-            try:
-                logger.info(f"Chargement des données en cache pour {ticker}")
-                return pd.read_csv(path, index_col=0, parse_dates=True)
-            except Exception as e:
-                logger.warning(f"Impossible de lire le cache pour {ticker}: {e}")
-    return None
+    path = _data_path(ticker, period)
+    mtime = _fresh_mtime(path, max_age)
+    if mtime is None:
+        return None
+    with _MEMORY_CACHE_LOCK:
+        entry = _MEMORY_CACHE.get(path)
+    if entry is not None and entry[0] == mtime:
+        # Copy so that callers never modify the shared frame
+        return entry[1].copy()
+    try:
+        logger.info(f"Chargement des données en cache pour {ticker}")
+        if DATA_EXT == 'parquet':
+            df = downcast_ohlcv(pd.read_parquet(path))
+        else:
+            df = downcast_ohlcv(pd.read_csv(path, index_col=0, parse_dates=True))
+    except Exception as e:
+        logger.warning(f"Impossible de lire le cache pour {ticker}: {e}")
+        return None
+    with _MEMORY_CACHE_LOCK:
+        _MEMORY_CACHE[path] = (mtime, df)
+    return df.copy()
 
 
 def save_to_cache(ticker: str, period: str, df: pd.DataFrame):
     """Save downloaded data to cache."""
-    path = _cache_path(ticker, period)
+    path = _cache_path(ticker, period, DATA_EXT)
     try:
-        df.to_csv(path)
+        df = downcast_ohlcv(df)
+        if DATA_EXT == 'parquet':
+            df.to_parquet(path, compression='snappy')
+        else:
+            df.to_csv(path)
+        with _MEMORY_CACHE_LOCK:
+            _MEMORY_CACHE.pop(path, None)
         logger.info(f"Données enregistrées dans le cache pour {ticker}")
     except Exception as e:
         logger.warning(f"Impossible d'enregistrer le cache pour {ticker}: {e}")
 
+
+
+def load_cached_json(ticker: str, name: str, max_age: timedelta = MAX_AGE):
+    """Load a cached JSON document if it exists and is recent enough."""
+    path = _cache_path(ticker, name, 'json')
+    if _fresh_mtime(path, max_age) is None:
+        return None
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except Exception as e:
+        logger.warning(f"Impossible de lire le cache {name} pour {ticker}: {e}")
+    return None
+
+
+def save_json_to_cache(ticker: str, name: str, data):
+    """Save a JSON-serialisable document to cache."""
+    path = _cache_path(ticker, name, 'json')
+    # Written next to the target then renamed, so that a concurrent reader
+    # (another thread or backtest worker) never sees a partial file
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(data, f, default=str)
+        os.replace(tmp, path)
+    except Exception as e:
+        logger.warning(f"Impossible d'enregistrer le cache {name} pour {ticker}: {e}")
@@ -3,6 +3,7 @@ import subprocess
 import logging
 import sys
 import importlib
+import runpy
 
 # Configuration
 REPO_URL = os.environ.get('REPO_URL', 'https://github.com/DamiGo/StockAnalyzer.git')
@@ -17,6 +18,17 @@ if not logger.handlers:
     logger.addHandler(handler)
 logger.propagate = False
 
+# The scripts of the checkout are imported from REPO_DIR, added once here
+if REPO_DIR not in sys.path:
+    sys.path.insert(0, REPO_DIR)
+
+
+def _cached_import(name):
+    """Return the module from sys.modules, importing it on first use only."""
+    module = sys.modules.get(name)
+    return module if module is not None else importlib.import_module(name)
+
+
 def _backup_config():
     """Return the current config.yaml content if it exists."""
     cfg_path = os.path.join(REPO_DIR, 'config.yaml')
@@ -71,19 +83,26 @@ def update_repo():
     backup = _backup_config()
     if not os.path.isdir(REPO_DIR):
         logger.info('Cloning repository %s into %s', REPO_URL, REPO_DIR)
-        subprocess.run(['git', 'clone', REPO_URL, REPO_DIR], check=True)
+        # Only the latest commit is needed to run the scripts
+        subprocess.run([
+            'git', 'clone', '--depth=1', '--single-branch', REPO_URL, REPO_DIR
+        ], check=True)
     else:
         logger.info('Fetching latest changes in %s', REPO_DIR)
-        subprocess.run(['git', '-C', REPO_DIR, 'fetch', '--all'], check=True)
         branch = subprocess.check_output([
             'git', '-C', REPO_DIR, 'rev-parse', '--abbrev-ref', 'HEAD'],
             text=True
         ).strip()
         subprocess.run([
-            'git', '-C', REPO_DIR, 'reset', '--hard', f'origin/{branch}'
+            'git', '-C', REPO_DIR, 'fetch', '--depth=1', 'origin', branch
+        ], check=True)
+        subprocess.run([
+            'git', '-C', REPO_DIR, 'reset', '--hard', 'FETCH_HEAD'
         ], check=True)
         subprocess.run(['git', '-C', REPO_DIR, 'clean', '-fd'], check=True)
     _merge_config(backup)
+    # REPO_DIR may not have existed when the import system last looked at it
+    importlib.invalidate_caches()
 
 _portfolio_ran = False
 
@@ -96,18 +115,21 @@ def run_portfolio_report():
         return
 
     try:
-        sys.path.insert(0, REPO_DIR)
-        module = importlib.import_module('analyse_portfolio')
+        module = _cached_import('analyse_portfolio')
 
         if hasattr(module, 'rapport_quotidien'):
             module.rapport_quotidien()
         elif hasattr(module, 'main'):
             module.main()
         else:
-            subprocess.run([
-                'python',
-                os.path.join(REPO_DIR, 'analyse_portfolio.py')
-            ], check=True)
+            # Run it as a script in this process instead of a new interpreter
+            try:
+                runpy.run_path(
+                    os.path.join(REPO_DIR, 'analyse_portfolio.py'), run_name='__main__'
+                )
+            except SystemExit as exc:
+                if exc.code not in (None, 0):
+                    raise RuntimeError(f'analyse_portfolio.py exited with {exc.code}')
 
         _portfolio_ran = True
     except ModuleNotFoundError:
@@ -118,17 +140,14 @@ def run_portfolio_report():
 def run_stock_analysis():
     """Run the stock analysis function."""
     try:
-        sys.path.insert(0, REPO_DIR)
-        from analyzer import tache_journaliere
-        tache_journaliere()
+        _cached_import('analyzer').tache_journaliere()
     except Exception as exc:
         logger.error('Erreur lors de l\'analyse des actions: %s', exc)
 
 def main():
     update_repo()
     try:
-        sys.path.insert(0, REPO_DIR)
-        import proxy_tester
+        proxy_tester = _cached_import('proxy_tester')
         proxy_tester.main(os.path.join(REPO_DIR, 'config.yaml'))
     except Exception as exc:
         logger.error('Erreur lors de la mise à jour des proxies: %s', exc)
@@ -1,11 +1,34 @@
+import json
 import logging
+import os
 import re
+import sqlite3
 import sys
-from typing import List
+import threading
+import time
+from contextlib import closing
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List, Optional, Tuple
 
 import yaml
 import requests
 from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# The C-based lxml parser is much faster than the pure-Python html.parser;
+# it is optional, html.parser is used when it is not installed.
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = "lxml"
+except ImportError:
+    HTML_PARSER = "html.parser"
+
+# orjson decodes JSON several times faster than the json module; optional too
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    json_loads = json.loads
 
 
 logger = logging.getLogger(__name__)
@@ -26,15 +49,49 @@ GEONODE_URL = (
 )
 SCRAPINGANT_URL = "https://scrapingant.com/free-proxies/"
 TEST_URL = "https://httpbin.org/ip"
+# Proxies tested simultaneously; each test waits on the network
+TEST_WORKERS = 200
+
+# Results of previous runs, so that only stale entries are tested again
+CACHE_DB = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cache", "proxies.db")
+# A working proxy is trusted for this many seconds
+GOOD_PROXY_TTL = 6 * 3600
+# A failed proxy is retried after BAD_PROXY_BACKOFF * 2**failures seconds
+BAD_PROXY_BACKOFF = 60
+MAX_BACKOFF_EXPONENT = 10
+# Combined list of fetched proxies, reused for FETCH_CACHE_TTL seconds
+FETCH_CACHE = os.path.join(os.path.dirname(CACHE_DB), "proxy_list.json")
+FETCH_CACHE_TTL = 30 * 60
+
+# Session shared by the proxy-source fetches: pooled connections and a short
+# retry with backoff on connection errors and 5xx answers
+_SOURCE_SESSION = requests.Session()
+_SOURCE_SESSION.headers.update(HEADERS)
+_SOURCE_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=8,
+    pool_maxsize=8,
+    max_retries=Retry(total=2, backoff_factor=0.3, status_forcelist=(500, 502, 503, 504)),
+))
+
+# One session per worker thread so connections and DNS lookups are reused
+_local = threading.local()
+
+
+def _get_session() -> requests.Session:
+    """Return the requests session of the current thread."""
+    session = getattr(_local, "session", None)
+    if session is None:
+        session = _local.session = requests.Session()
+    return session
 
 
 def _fetch_from_free_proxy_list() -> List[str]:
     """Return proxies from free-proxy-list.net."""
     logger.info("Fetching proxy list from %s", FREE_PROXY_LIST_URL)
-    response = requests.get(FREE_PROXY_LIST_URL, headers=HEADERS, timeout=10)
+    response = _SOURCE_SESSION.get(FREE_PROXY_LIST_URL, timeout=10)
     response.raise_for_status()
 
-    soup = BeautifulSoup(response.text, "html.parser")
+    soup = BeautifulSoup(response.text, HTML_PARSER)
     proxies = []
 
     for row in soup.select("table#proxylisttable tbody tr"):
@@ -49,10 +106,10 @@ def _fetch_from_free_proxy_list() -> List[str]:
 def _fetch_from_geonode() -> List[str]:
     """Return proxies from geonode.com (HTTPS only)."""
     logger.info("Fetching proxy list from geonode")
-    response = requests.get(GEONODE_URL, headers=HEADERS, timeout=10)
+    response = _SOURCE_SESSION.get(GEONODE_URL, timeout=10)
     response.raise_for_status()
 
-    data = response.json()
+    data = json_loads(response.content)
     proxies = [f"{p['ip']}:{p['port']}" for p in data.get("data", [])]
 
     logger.info("Found %d proxies on geonode", len(proxies))
@@ -62,10 +119,10 @@ def _fetch_from_geonode() -> List[str]:
 def _fetch_from_scrapingant() -> List[str]:
     """Return proxies from scrapingant.com (HTTPS)."""
     logger.info("Fetching proxy list from scrapingant")
-    response = requests.get(SCRAPINGANT_URL, headers=HEADERS, timeout=10)
+    response = _SOURCE_SESSION.get(SCRAPINGANT_URL, timeout=10)
     response.raise_for_status()
 
-    soup = BeautifulSoup(response.text, "html.parser")
+    soup = BeautifulSoup(response.text, HTML_PARSER)
     proxies = []
     for row in soup.select("table tbody tr"):
         cols = [c.text.strip() for c in row.find_all("td")]
@@ -76,26 +133,73 @@ def _fetch_from_scrapingant() -> List[str]:
     return proxies
 
 
-def fetch_proxies() -> List[str]:
-    """Return a combined list of proxies from multiple sources."""
-    proxies: List[str] = []
+def _load_fetch_cache(sources: List[str]) -> Optional[List[str]]:
+    """Return the cached proxy list if it is recent and from the same sources."""
     try:
-        proxies.extend(_fetch_from_free_proxy_list())
-    except Exception as exc:
-        logger.warning("free-proxy-list.net fetch failed: %s", exc)
-
-    try:
-        proxies.extend(_fetch_from_geonode())
-    except Exception as exc:
-        logger.warning("geonode fetch failed: %s", exc)
-
+        if time.time() - os.stat(FETCH_CACHE).st_mtime >= FETCH_CACHE_TTL:
+            return None
+        with open(FETCH_CACHE, "rb") as f:
+            data = json_loads(f.read())
+    except (OSError, ValueError):
+        return None
+    if data.get("sources") != sources:
+        return None
+    return data.get("proxies")
+
+
+def _save_fetch_cache(sources: List[str], proxies: List[str]) -> None:
+    """Write the fetched proxy list to FETCH_CACHE (atomic replace)."""
+    tmp = FETCH_CACHE + ".tmp"
     try:
-        proxies.extend(_fetch_from_scrapingant())
-    except Exception as exc:
-        logger.warning("scrapingant fetch failed: %s", exc)
-
+        os.makedirs(os.path.dirname(FETCH_CACHE), exist_ok=True)
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"sources": sources, "proxies": proxies}, f)
+        os.replace(tmp, FETCH_CACHE)
+    except OSError as exc:
+        logger.warning("Could not write the proxy list cache: %s", exc)
+
+
+# Proxy sources by name, queried in this order
+FETCHERS = {
+    "free-proxy-list.net": _fetch_from_free_proxy_list,
+    "geonode": _fetch_from_geonode,
+    "scrapingant": _fetch_from_scrapingant,
+}
+
+
+def fetch_proxies(sources: Optional[List[str]] = None) -> List[str]:
+    """Return a combined list of proxies from the given FETCHERS sources (all by default)."""
+    if sources is None:
+        sources = list(FETCHERS)
+    unknown = [name for name in sources if name not in FETCHERS]
+    if unknown:
+        logger.warning("Unknown proxy sources ignored: %s", ", ".join(unknown))
+    sources = [name for name in sources if name in FETCHERS]
+    if not sources:
+        return []
+
+    cached = _load_fetch_cache(sources)
+    if cached is not None:
+        logger.info("Reusing %d proxies fetched less than %d minutes ago",
+                    len(cached), FETCH_CACHE_TTL // 60)
+        return cached
+
+    # The sources are queried at the same time; results keep the order above
+    found = {}
+    with ThreadPoolExecutor(max_workers=len(sources)) as executor:
+        futures = {executor.submit(FETCHERS[name]): name for name in sources}
+        for future in as_completed(futures):
+            name = futures[future]
+            try:
+                found[name] = future.result()
+            except Exception as exc:
+                logger.warning("%s fetch failed: %s", name, exc)
+
+    proxies = [p for name in sources for p in found.get(name, [])]
     unique_proxies = list(dict.fromkeys(proxies))
     logger.info("Total proxies fetched: %d", len(unique_proxies))
+    if unique_proxies:
+        _save_fetch_cache(sources, unique_proxies)
     return unique_proxies
 
 
@@ -103,20 +207,65 @@ def test_proxy(proxy: str) -> bool:
     """Return True if the HTTPS proxy works."""
     proxies = {"https": f"https://{proxy}"}
     try:
-        requests.get(TEST_URL, proxies=proxies, timeout=5)
-        return True
+        # HEAD: reachability is enough, the response body is never read
+        response = _get_session().head(
+            TEST_URL, proxies=proxies, timeout=5, allow_redirects=False
+        )
+        return response.status_code < 500
     except Exception as exc:
         logger.debug("Proxy %s failed: %s", proxy, exc)
         return False
 
 
-def update_config(proxies: List[str], config_path: str = "config.yaml") -> None:
-    """Update the YAML configuration file with the working proxies."""
+def _open_cache() -> sqlite3.Connection:
+    """Open the proxy result cache, creating it if needed."""
+    os.makedirs(os.path.dirname(CACHE_DB), exist_ok=True)
+    conn = sqlite3.connect(CACHE_DB)
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS proxies ("
+        "proxy TEXT PRIMARY KEY, ok INTEGER, checked REAL, fail_count INTEGER)"
+    )
+    return conn
+
+
+def _load_cache(conn: sqlite3.Connection) -> Dict[str, Tuple[bool, float, int]]:
+    """Return {proxy: (ok, checked, fail_count)} for every cached proxy."""
+    rows = conn.execute("SELECT proxy, ok, checked, fail_count FROM proxies")
+    return {proxy: (bool(ok), checked, fail_count) for proxy, ok, checked, fail_count in rows}
+
+
+def _is_recent(entry: Tuple[bool, float, int], now: float) -> bool:
+    """Whether a cached result can be reused instead of testing the proxy."""
+    ok, checked, fail_count = entry
+    if ok:
+        return now - checked < GOOD_PROXY_TTL
+    delay = BAD_PROXY_BACKOFF * 2 ** min(fail_count, MAX_BACKOFF_EXPONENT)
+    return now - checked < delay
+
+
+def _store_results(conn: sqlite3.Connection, results: Dict[str, bool],
+                   cached: Dict[str, Tuple[bool, float, int]], now: float) -> None:
+    """Record new test results; failures extend the retry delay."""
+    rows = []
+    for proxy, ok in results.items():
+        failures = 0 if ok else cached.get(proxy, (True, 0.0, 0))[2] + 1
+        rows.append((proxy, int(ok), now, failures))
+    with conn:
+        conn.executemany("INSERT OR REPLACE INTO proxies VALUES (?, ?, ?, ?)", rows)
+
+
+def _load_config(config_path: str) -> dict:
+    """Return the YAML configuration, or an empty dict if the file is missing."""
     try:
         with open(config_path, "r", encoding="utf-8") as f:
-            cfg = yaml.safe_load(f) or {}
+            return yaml.safe_load(f) or {}
     except FileNotFoundError:
-        cfg = {}
+        return {}
+
+
+def update_config(proxies: List[str], config_path: str = "config.yaml") -> None:
+    """Update the YAML configuration file with the working proxies."""
+    cfg = _load_config(config_path)
 
     cfg["proxies"] = proxies
 
@@ -128,15 +277,36 @@ def update_config(proxies: List[str], config_path: str = "config.yaml") -> None:
 
 def main(config_path: str = "config.yaml") -> None:
     """Fetch proxies, test them and update the config file."""
-    proxies = fetch_proxies()
-    ok, ko = [], []
-    for proxy in proxies:
-        if test_proxy(proxy):
-            logger.info("[OK] %s", proxy)
-            ok.append(proxy)
-        else:
-            logger.info("[KO] %s", proxy)
-            ko.append(proxy)
+    proxies = fetch_proxies(_load_config(config_path).get("proxy_sources"))
+    now = time.time()
+    try:
+        with closing(_open_cache()) as conn:
+            cached = _load_cache(conn)
+    except sqlite3.Error as exc:
+        logger.warning("Proxy cache unavailable: %s", exc)
+        cached = {}
+    results = {p: cached[p][0] for p in proxies if p in cached and _is_recent(cached[p], now)}
+    to_test = [p for p in proxies if p not in results]
+    logger.info("%d proxies reused from cache, %d to test", len(results), len(to_test))
+
+    tested = {}
+    with ThreadPoolExecutor(max_workers=TEST_WORKERS) as executor:
+        futures = {executor.submit(test_proxy, proxy): proxy for proxy in to_test}
+        for future in as_completed(futures):
+            proxy = futures[future]
+            tested[proxy] = future.result()
+            logger.info("[%s] %s", "OK" if tested[proxy] else "KO", proxy)
+    results.update(tested)
+
+    try:
+        with closing(_open_cache()) as conn:
+            _store_results(conn, tested, cached, time.time())
+    except sqlite3.Error as exc:
+        logger.warning("Could not update the proxy cache: %s", exc)
+
+    # Keep the order of the fetched list
+    ok = [p for p in proxies if results[p]]
+    ko = [p for p in proxies if not results[p]]
 
     update_config(ok, config_path)
 
@@ -0,0 +1,60 @@
+"""Univers d'actions européennes partagé par analyzer.py et backtest.py."""
+
+# Actions analysées par analyse_sbf_120 et rejouées par le backtest
+TICKERS_EUROPE = [
+    # SBF 120 (France) - votre liste actuelle
+    "AC.PA", "ADP.PA", "AF.PA", "AI.PA", "AIR.PA", "ALO.PA", "ATE.PA", "AMUN.PA",
+    "APAM.AS", "MT.AS", "ARG.PA", "AKE.PA", "ATO.PA", "CS.PA", "0RSP.L", "BEN.PA",
+    "BB.PA", "BIM.PA", "BNP.PA", "BOL.PA", "EN.PA", "BVI.PA", "CAP.PA", "CARM.PA",
+    "CA.PA", "CLARI.PA", "COFA.PA", "COV.PA", "ACA.PA", "BN.PA", "AM.PA", "DSY.PA",
+    "DBG.PA", "EDEN.PA", "FGR.PA", "ELIOR.PA", "ELIS.PA", "EMEIS.PA", "ENGI.PA",
+    "ERA.PA", "EL.PA", "ES.PA", "RF.PA", "ERF.PA", "ENX.PA", "FDJ.PA", "FRVIA.PA",
+    "GFC.PA", "GET.PA", "GTT.PA", "RMS.PA", "ICAD.PA", "IDL.PA", "NK.PA", "ITP.PA",
+    "IPN.PA", "IPS.PA", "DEC.PA", "KER.PA", "LI.PA", "OR.PA", "LR.PA", "MC.PA",
+    "MAU.PA", "MEDCL.PA", "MERY.PA", "MRN.PA", "MMT.PA", "ML.PA", "NEOEN.PA",
+    "NEX.PA", "NXI.PA", "OPM.PA", "ORA.PA", "RI.PA", "PLNW.PA", "PLX.PA", "PUB.PA",
+    "RCO.PA", "RNO.PA", "RXL.PA", "RBT.PA", "RUI.PA", "SK.PA", "SAF.PA", "SGO.PA",
+    "SAN.PA", "DIM.PA", "SU.PA", "SCR.PA", "SESG.PA", "GLE.PA", "SW.PA", "SOI.PA",
+    "SOLB.BR", "SOP.PA", "SPIE.PA", "STLAP.PA", "STMPA.PA", "TE.PA", "TEP.PA", "TFI.PA",
+    "HO.PA", "TTE.PA", "TRI.PA", "UBI.PA", "URW.PA", "FR.PA", "VK.PA", "VLA.PA",
+    "VIE.PA", "VRLA.PA", "VCT.PA", "DG.PA", "VIRP.PA", "VIRI.PA", "VIV.PA", "VU.PA",
+    "MF.PA", "WLN.PA",
+
+    # Allemagne (DAX)
+    "ADS.DE", "ALV.DE", "BAYN.DE", "BMW.DE", "MBG.DE", "DBK.DE", "DTE.DE",
+    "EOAN.DE", "SAP.DE", "SIE.DE", "VOW3.DE", "DHL.DE", "HEN3.DE", "IFX.DE", "MRK.DE",
+
+    # Pays-Bas (AEX)
+    "ASML.AS", "INGA.AS", "PHIA.AS", "WKL.AS", "ADYEN.AS", "HEIA.AS", "KPN.AS",
+    "DSMN.AS", "ABN.AS", "AKZA.AS",
+
+    # Espagne (IBEX)
+    "SAN.MC", "TEF.MC", "IBE.MC", "BBVA.MC", "ITX.MC", "ELE.MC", "AMS.MC",
+    "CABK.MC", "REP.MC", "ACS.MC",
+
+    # Italie (FTSE MIB)
+    "ISP.MI", "ENI.MI", "ENEL.MI", "STLAM.MI", "UCG.MI", "TIT.MI", "PRY.MI",
+    "G.MI", "BAMI.MI", "MB.MI",
+
+    # Suisse (SMI)
+    "NESN.SW", "ROG.SW", "NOVN.SW", "UHR.SW", "ZURN.SW", "SIKA.SW", "LONN.SW",
+    "CFR.SW", "GEBN.SW", "SREN.SW",
+
+    # Royaume-Uni (FTSE 100)
+    "GSK.L", "AZN.L", "BP.L", "ULVR.L", "HSBA.L", "RIO.L", "LSEG.L",
+    "REL.L", "SHEL.L", "BHP.L",
+
+    # Suède (OMX Stockholm)
+    "ERIC-B.ST", "VOLV-B.ST", "SEB-A.ST", "ATCO-A.ST", "SHB-A.ST", "SCA-B.ST",
+    "ESSITY-B.ST", "SAND.ST", "ABB.ST", "INVE-B.ST",
+
+    # Finlande (OMX Helsinki)
+    "NOKIA.HE", "STERV.HE", "SAMPO.HE", "UPM.HE", "FORTUM.HE", "ORNBV.HE",
+    "KESKOB.HE", "NESTE.HE", "KNEBV.HE", "ELISA.HE",
+
+    # Belgique (BEL 20)
+    "ABI.BR", "KBC.BR", "COLR.BR", "UCB.BR", "GLPG.BR",
+
+    # Danemark (OMX Copenhagen)
+    "NOVO-B.CO", "DSV.CO", "MAERSK-B.CO", "CARL-B.CO", "COLO-B.CO"
+]
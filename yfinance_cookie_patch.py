@@ -11,11 +11,17 @@ def _wrap_cookie(cookie, session):
 
 
 def patch_yfdata_cookie_basic():
-    """Monkey-patch YfData._get_cookie_basic to always return a Cookie object."""
+    """Monkey-patch YfData._get_cookie_basic to always return a Cookie object.
+
+    Calling it again (analyzer and analyse_portfolio both do) leaves the
+    existing patch in place instead of wrapping it a second time.
+    """
     original = _data.YfData._get_cookie_basic
+    if getattr(original, '_cookie_patched', False):
+        return
 
     def _patched(self, timeout=30):
-        cookie = original(self, timeout)
-        return _wrap_cookie(cookie, self._session)
+        return _wrap_cookie(original(self, timeout), self._session)
 
+    _patched._cookie_patched = True
     _data.YfData._get_cookie_basic = _patched